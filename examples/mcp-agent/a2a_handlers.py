@@ -5,14 +5,61 @@ Manages message sending, receiving, and validation for inter-agent communication
 
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple, Union, Annotated
+import msgspec
+import requests
 from fastapi import HTTPException
+from requests.adapters import HTTPAdapter
 from orca_agent_sdk.core.a2a import A2AProtocol, AgentRegistry
 from config import A2AConfig
 from logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_NonEmptyStr = Annotated[str, msgspec.Meta(min_length=1)]
+
+
+class A2AHeader(msgspec.Struct, frozen=True):
+    """Routing header of an A2A message"""
+    message_id: _NonEmptyStr
+    from_: _NonEmptyStr = msgspec.field(name="from")
+    to: str
+    timestamp: Union[int, float]
+
+
+class A2ATask(msgspec.Struct, frozen=True):
+    """Task section of an A2A message; extra protocol keys (taskId, maxBudget, ...) are ignored"""
+    action: Annotated[str, msgspec.Meta(pattern=r"\S")]
+    payload: Dict[str, Any]
+
+
+class A2AMessage(msgspec.Struct, frozen=True):
+    """A2A message envelope, converted from the decoded request body"""
+    header: A2AHeader
+    task: A2ATask
+
+
+def create_a2a_session(a2a_config: A2AConfig) -> requests.Session:
+    """
+    Create the keep-alive session an A2AProtocol sends peer messages through.
+    
+    Args:
+        a2a_config: A2A configuration; connection_pool_size sizes the pool
+        
+    Returns:
+        Session with an HTTPAdapter pool mounted for http and https
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=a2a_config.connection_pool_size,
+        pool_maxsize=a2a_config.connection_pool_size,
+        max_retries=0
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class A2AHandlers:
     """
     Handlers for Agent-to-Agent communication.
@@ -23,6 +70,14 @@ class A2AHandlers:
         self.protocol = a2a_protocol
         self.config = a2a_config
         self.registry = a2a_protocol.registry
+        
+        # Action name -> bound handler, resolved with one dict lookup per message
+        self._action_handlers = {
+            "ping": self._handle_ping,
+            "query_market_data": self._handle_market_data_query,
+            "notify": self._handle_notification,
+            "status": self._handle_status_request
+        }
         logger.log_service_initialization("A2AHandlers", True, {
             "agent_id": self.config.agent_id
         })
@@ -143,11 +198,14 @@ class A2AHandlers:
             HTTPException: If message validation fails or processing errors occur
         """
         try:
-            # Validate message schema first
-            if not self.validate_message_schema(message):
+            # Validate and convert to typed structs in one pass
+            parsed, schema_error = self._parse_message(message)
+            
+            if schema_error:
                 error_details = {
                     "type": "schema_validation_error",
-                    "message": "Invalid A2A message schema"
+                    "message": "Invalid A2A message schema",
+                    "validation_errors": [schema_error]
                 }
                 
                 logger.log_a2a_communication(False, {
@@ -162,12 +220,10 @@ class A2AHandlers:
                     detail="Invalid A2A message schema"
                 )
             
-            # Extract message components
-            header = message["header"]
-            task = message["task"]
-            from_agent = header["from"]
-            action = task["action"]
-            payload = task["payload"]
+            header = parsed.header
+            from_agent = header.from_
+            action = parsed.task.action
+            payload = parsed.task.payload
             
             logger.logger.info(f"Processing A2A message from {from_agent}: action={action}")
             
@@ -181,12 +237,12 @@ class A2AHandlers:
                 "direction": "receive",
                 "action": action,
                 "from_agent": from_agent,
-                "message_id": header["message_id"]
+                "message_id": header.message_id
             })
             
             return {
                 "status": "success",
-                "message_id": header["message_id"],
+                "message_id": header.message_id,
                 "from_agent": from_agent,
                 "action": action,
                 "result": result,
@@ -222,6 +278,42 @@ class A2AHandlers:
             logger.log_error(e, {"operation": "a2a_receive", "message": message})
             raise HTTPException(status_code=500, detail=f"Message processing failed: {str(e)}")
     
+    def _parse_message(self, message: Any) -> Tuple[Optional[A2AMessage], Optional[str]]:
+        """
+        Convert a decoded message into typed structs and check its routing.
+        
+        The struct conversion checks shape, types and non-empty fields; this is
+        the single place the A2A message schema is enforced.
+        
+        Args:
+            message: Decoded message to validate
+            
+        Returns:
+            Tuple of the parsed message (None if invalid) and the validation error, if any
+        """
+        try:
+            parsed = msgspec.convert(message, A2AMessage)
+        except msgspec.ValidationError as e:
+            return None, str(e)
+        
+        routing_error = self._check_routing(parsed.header)
+        if routing_error:
+            return None, routing_error
+        return parsed, None
+    
+    def _check_routing(self, header: A2AHeader) -> Optional[str]:
+        """
+        Check the header rules a struct conversion cannot express.
+        
+        Returns:
+            Error description, or None if the header is acceptable
+        """
+        if header.to != self.config.agent_id:
+            return f"Message destination {header.to} does not match agent ID {self.config.agent_id}"
+        if not header.timestamp:
+            return "Empty header field: timestamp"
+        return None
+    
     def validate_message_schema(self, message: Dict[str, Any]) -> bool:
         """
         Validate A2A message schema according to protocol specification.
@@ -232,67 +324,22 @@ class A2AHandlers:
         Returns:
             True if message is valid, False otherwise
         """
-        validation_errors = []
-        
         try:
-            # Check top-level structure
-            if not isinstance(message, dict):
-                validation_errors.append("Message is not a dictionary")
-                return False
-            
-            # Required top-level fields
-            required_fields = ['header', 'task']
-            for field in required_fields:
-                if field not in message:
-                    validation_errors.append(f"Missing required field: {field}")
+            _, schema_error = self._parse_message(message)
+            if schema_error is None:
+                return True
             
-            # Validate header structure
-            header = message.get('header', {})
+            # Log validation errors
+            header = message.get('header') if isinstance(message, dict) else None
             if not isinstance(header, dict):
-                validation_errors.append("Header is not a dictionary")
-            else:
-                header_fields = ['message_id', 'from', 'to', 'timestamp']
-                for field in header_fields:
-                    if field not in header:
-                        validation_errors.append(f"Missing header field: {field}")
-                    elif not header[field]:  # Check for empty values
-                        validation_errors.append(f"Empty header field: {field}")
-            
-            # Validate task structure
-            task = message.get('task', {})
-            if not isinstance(task, dict):
-                validation_errors.append("Task is not a dictionary")
-            else:
-                task_fields = ['action', 'payload']
-                for field in task_fields:
-                    if field not in task:
-                        validation_errors.append(f"Missing task field: {field}")
-            
-            # Validate specific field types
-            if header and 'timestamp' in header and not isinstance(header['timestamp'], (int, float)):
-                validation_errors.append("Timestamp must be numeric")
-            
-            if task and 'action' in task and (not isinstance(task['action'], str) or not task['action'].strip()):
-                validation_errors.append("Action must be a non-empty string")
-            
-            if task and 'payload' in task and not isinstance(task['payload'], dict):
-                validation_errors.append("Payload must be a dictionary")
-            
-            # Validate destination matches our agent
-            if header and 'to' in header and header['to'] != self.config.agent_id:
-                validation_errors.append(f"Message destination {header['to']} does not match agent ID {self.config.agent_id}")
-            
-            # Log validation errors if any
-            if validation_errors:
-                logger.log_error(Exception("A2A message validation failed"), {
-                    "operation": "message_validation",
-                    "validation_errors": validation_errors,
-                    "message_id": header.get("message_id") if header else None,
-                    "from_agent": header.get("from") if header else None
-                })
-                return False
-            
-            return True
+                header = {}
+            logger.log_error(Exception("A2A message validation failed"), {
+                "operation": "message_validation",
+                "validation_errors": [schema_error],
+                "message_id": header.get("message_id"),
+                "from_agent": header.get("from")
+            })
+            return False
             
         except Exception as e:
             logger.log_error(e, {"operation": "message_validation", "message": message})
@@ -311,25 +358,18 @@ class A2AHandlers:
             Processing result
         """
         try:
-            # Handle different action types
-            if action == "ping":
-                return self._handle_ping(payload, from_agent)
-            elif action == "query_market_data":
-                return self._handle_market_data_query(payload, from_agent)
-            elif action == "notify":
-                return self._handle_notification(payload, from_agent)
-            elif action == "status":
-                return self._handle_status_request(payload, from_agent)
-            else:
-                logger.warning(f"Unknown action type: {action}")
+            handler = self._action_handlers.get(action)
+            if handler is None:
+                logger.logger.warning(f"Unknown action type: {action}")
                 return {
                     "status": "unknown_action",
                     "message": f"Action '{action}' is not supported",
-                    "supported_actions": ["ping", "query_market_data", "notify", "status"]
+                    "supported_actions": list(self._action_handlers)
                 }
-                
+            return handler(payload, from_agent)
+            
         except Exception as e:
-            logger.error(f"Action processing error for {action}: {e}")
+            logger.logger.error(f"Action processing error for {action}: {e}")
             return {
                 "status": "error",
                 "message": f"Failed to process action '{action}': {str(e)}"
@@ -5,6 +5,7 @@ Handles HTTP endpoints, payment verification, and request routing.
 
 import sys
 import os
+import gc
 import logging
 import time
 from typing import Dict, Any, Optional
@@ -22,7 +23,7 @@ from orca_agent_sdk.core.a2a import A2AProtocol, AgentRegistry
 from config import get_config
 from market_data import MarketDataService, MCPAPIError
 from crewai_backend import MCPCrewAIBackend
-from a2a_handlers import A2AHandlers
+from a2a_handlers import A2AHandlers, create_a2a_session
 from logging_config import get_logger
 
 # Configure enhanced logging
@@ -51,6 +52,21 @@ payment_manager = None
 market_data_service = None
 crewai_backend = None
 a2a_handlers = None
+startup_frozen = False
+
+def freeze_startup_state():
+    """
+    Move everything allocated so far (config, loggers, services) into the GC's
+    permanent generation so later collections only scan short-lived request
+    objects. Runs once per process.
+    """
+    global startup_frozen
+    if startup_frozen:
+        return
+    startup_frozen = True
+    # Collect first so startup garbage isn't pinned in the frozen generation
+    gc.collect()
+    gc.freeze()
 
 def initialize_services():
     """Initialize all agent services and dependencies"""
@@ -113,7 +129,12 @@ def initialize_services():
         # Initialize A2A handlers
         try:
             registry = AgentRegistry()
-            a2a_protocol = A2AProtocol(config.a2a.agent_id, registry)
+            a2a_protocol = A2AProtocol(
+                config.a2a.agent_id,
+                registry,
+                session=create_a2a_session(config.a2a),
+                timeout=config.a2a.message_timeout
+            )
             a2a_handlers = A2AHandlers(a2a_protocol, config.a2a)
             logger.log_service_initialization("A2AHandlers", True, {
                 "agent_id": config.a2a.agent_id
@@ -124,6 +145,9 @@ def initialize_services():
         
         logger.logger.info("All services initialized successfully")
         
+        # Long-lived startup objects no longer need to be traversed by the GC
+        freeze_startup_state()
+        
     except Exception as e:
         logger.log_error(e, {"phase": "service_initialization"}, "CRITICAL")
         raise
@@ -382,13 +406,13 @@ async def chat_endpoint(
         # Fetch market data (try-except for resilience)
         market_data = {}
         try:
-            market_data = market_data_service.get_market_summary(symbols)
+            market_data = await market_data_service.get_market_summary_async(symbols)
         except Exception as e:
             logger.logger.warning(f"Resilient fallback: Manual market data fetch failed ({e}). Proceeding to CrewAI agent tools.")
 
         # Process market data through CrewAI backend
         try:
-            ai_response = crewai_backend.process_market_data(market_data, user_query)
+            ai_response = await crewai_backend.process_market_data_async(market_data, user_query)
             processing_time = int((time.time() - start_time) * 1000)
             
             logger.log_processing_performance("chat_request", processing_time, {
@@ -3,6 +3,7 @@ Configuration management for MCP Market Data Agent.
 Centralizes all configuration settings for MCP API, payment, and CrewAI parameters.
 """
 
+import functools
 import os
 from dataclasses import dataclass
 from typing import Dict, Any, Optional
@@ -11,12 +12,14 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-@dataclass
+@dataclass(slots=True)
 class MCPConfig:
     """Configuration for MCP Market Data API"""
     api_endpoint: str = "https://mcp.crypto.com/market-data/mcp"
     timeout_seconds: int = 30
     retry_attempts: int = 1
+    connection_pool_size: int = 32
+    stream_parse_min_symbols: int = 500  # Stream-parse larger requests when ijson is installed
     api_key: Optional[str] = None
     
     def __post_init__(self):
@@ -24,7 +27,7 @@ class MCPConfig:
         if self.api_key is None:
             self.api_key = os.getenv("MCP_API_KEY")
 
-@dataclass
+@dataclass(slots=True)
 class PaymentConfig:
     """Configuration for x402 payment settings"""
     price: str = "0.1"  # Default price in tokens
@@ -37,7 +40,7 @@ class PaymentConfig:
         if self.facilitator_url is None:
             self.facilitator_url = os.getenv("CRONOS_FACILITATOR_URL")
 
-@dataclass
+@dataclass(slots=True)
 class CrewAIConfig:
     """Configuration for CrewAI backend parameters"""
     model: str = "gemini-2.0-flash"
@@ -46,6 +49,10 @@ class CrewAIConfig:
     temperature: float = 0.7
     max_tokens: int = 1000
     processing_timeout: int = 30
+    max_concurrent_kickoffs: int = 4
+    cache_path: Optional[str] = None  # Prompt cache disabled unless set
+    cache_ttl_seconds: int = 60
+    cache_max_entries: int = 1000
     mcps: list = None
     
     def __post_init__(self):
@@ -59,20 +66,24 @@ class CrewAIConfig:
         # Load API key from environment if not provided
         if self.api_key is None:
             self.api_key = os.getenv("GEMINI_API_KEY")
+        # Load prompt cache location from environment if not provided
+        if self.cache_path is None:
+            self.cache_path = os.getenv("PROMPT_CACHE_PATH")
 
-@dataclass
+@dataclass(slots=True)
 class A2AConfig:
     """Configuration for Agent-to-Agent communication"""
     agent_id: str = "mcp-market-data-agent"
     registry_endpoint: Optional[str] = None
     message_timeout: int = 10
+    connection_pool_size: int = 10
     
     def __post_init__(self):
         # Load registry endpoint from environment if not provided
         if self.registry_endpoint is None:
             self.registry_endpoint = os.getenv("AGENT_REGISTRY_ENDPOINT")
 
-@dataclass
+@dataclass(slots=True)
 class ServerConfig:
     """Configuration for FastAPI server"""
     host: str = "0.0.0.0"
@@ -137,15 +148,22 @@ class AgentConfiguration:
     
     def get_mcp_headers(self) -> Dict[str, str]:
         """Get headers for MCP API requests"""
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": f"{self.a2a.agent_id}/1.0"
-        }
-        
-        if self.mcp.api_key:
-            headers["Authorization"] = f"Bearer {self.mcp.api_key}"
-        
-        return headers
+        # Copy so callers can add headers without touching the cached entry
+        return dict(_mcp_headers(self.a2a.agent_id, self.mcp.api_key))
+
+
+@functools.lru_cache(maxsize=128)
+def _mcp_headers(agent_id: str, api_key: Optional[str]) -> Dict[str, str]:
+    """Build MCP API headers once per (agent_id, api_key) pair"""
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": f"{agent_id}/1.0"
+    }
+    
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    
+    return headers
 
 # Global configuration instance - initialized lazily
 config = None
@@ -1,7 +1,8 @@
-import logging
+import asyncio
 import json
 import time
-from typing import Dict, Any, Optional, List
+import weakref
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 from orca_agent_sdk.backends.crewai_backend import CrewAIBackend
@@ -10,9 +11,11 @@ from orca_agent_sdk.config import AgentConfig
 try:
     from .market_data import MarketDataResponse
     from .logging_config import get_logger
+    from .prompt_cache import PromptCache
 except ImportError:
     from market_data import MarketDataResponse
     from logging_config import get_logger
+    from prompt_cache import PromptCache
 
 logger = get_logger(__name__)
 
@@ -38,7 +41,20 @@ class MCPCrewAIBackend(CrewAIBackend):
             }
         )
         self.initialize(self.sdk_config)
-        
+
+        # Caps how many Crew kickoffs process_market_data_async runs at once; an asyncio
+        # semaphore binds to one loop, so each running loop gets its own on first use
+        self._max_concurrent_kickoffs = getattr(crewai_config, 'max_concurrent_kickoffs', 4)
+        self._kickoff_semaphores = weakref.WeakKeyDictionary()
+
+        # Optional on-disk cache so identical prompts are not re-sent after a restart
+        cache_path = getattr(crewai_config, 'cache_path', None)
+        self.prompt_cache = PromptCache(
+            cache_path,
+            ttl_seconds=getattr(crewai_config, 'cache_ttl_seconds', 60),
+            max_entries=getattr(crewai_config, 'cache_max_entries', 1000)
+        ) if cache_path else None
+
         logger.log_service_initialization("MCPCrewAIBackend", True, {
             "model": self.crew_config.model,
             "mcps_count": len(getattr(crewai_config, 'mcps', []))
@@ -49,35 +65,21 @@ class MCPCrewAIBackend(CrewAIBackend):
         Process market data into natural language response using CrewAI.
         """
         start_time = time.time()
-        
+
         try:
-            # Prepare market data for context (if available)
-            market_summary = self._prepare_market_data_for_ai(market_data) if market_data else {}
-            
-            # Construct a comprehensive prompt
-            if market_summary:
-                prompt = f"""
-                User Query: {user_query}
-                
-                Current Market Data:
-                {json.dumps(market_summary, indent=2)}
-                
-                Please analyze this data and provide a professional response.
-                """
-            else:
-                prompt = user_query
-            
+            prompt = self._build_market_prompt(market_data, user_query)
+
             # Use the base handle_prompt which triggers the Crew kickoff
-            response = self.handle_prompt(prompt)
-            
+            response = self._handle_prompt_cached(prompt)
+
             processing_time = int((time.time() - start_time) * 1000)
             logger.log_processing_performance("crewai_market_analysis", processing_time, {
                 "symbols_count": len(market_data),
                 "response_length": len(response)
             })
-            
+
             return response
-                
+
         except Exception as e:
             processing_time = int((time.time() - start_time) * 1000)
             logger.log_error(e, {
@@ -85,18 +87,104 @@ class MCPCrewAIBackend(CrewAIBackend):
                 "processing_time_ms": processing_time
             })
             return f"Error processing market data: {str(e)}"
-    
+
+    async def process_market_data_async(self, market_data: Dict[str, MarketDataResponse], user_query: str = "") -> str:
+        """
+        Async variant of process_market_data for callers running on the event loop.
+        The blocking Crew kickoff runs in a worker thread, bounded by max_concurrent_kickoffs.
+        """
+        start_time = time.time()
+
+        try:
+            prompt = self._build_market_prompt(market_data, user_query)
+
+            async with self._get_kickoff_semaphore():
+                response = await asyncio.to_thread(self._handle_prompt_cached, prompt)
+
+            processing_time = int((time.time() - start_time) * 1000)
+            logger.log_processing_performance("crewai_market_analysis", processing_time, {
+                "symbols_count": len(market_data),
+                "response_length": len(response)
+            })
+
+            return response
+
+        except Exception as e:
+            processing_time = int((time.time() - start_time) * 1000)
+            logger.log_error(e, {
+                "operation": "process_market_data_async",
+                "processing_time_ms": processing_time
+            })
+            return f"Error processing market data: {str(e)}"
+
+    def _get_kickoff_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._kickoff_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._kickoff_semaphores[loop] = asyncio.Semaphore(self._max_concurrent_kickoffs)
+        return semaphore
+
+    def _handle_prompt_cached(self, prompt: str) -> str:
+        if self.prompt_cache is None:
+            return self.handle_prompt(prompt)
+
+        cached = self.prompt_cache.get(prompt)
+        if cached is not None:
+            return cached
+
+        response = self.handle_prompt(prompt)
+        if not response.startswith("Error:"):
+            self.prompt_cache.set(prompt, response)
+        return response
+
+    def _build_market_prompt(self, market_data: Dict[str, MarketDataResponse], user_query: str) -> str:
+        # Prepare market data for context (if available)
+        market_summary = self._prepare_market_data_for_ai(market_data) if market_data else {}
+
+        # Construct a comprehensive prompt
+        if market_summary:
+            return f"""
+                User Query: {user_query}
+
+                Current Market Data:
+                {json.dumps(market_summary, indent=2)}
+
+                Please analyze this data and provide a professional response.
+                """
+        return user_query
+
     def _prepare_market_data_for_ai(self, market_data: Dict[str, MarketDataResponse]) -> Dict[str, Any]:
         prepared_data = {}
+        # Symbols from one fetch usually share a timestamp, so format each distinct value once
+        formatted_timestamps = {}
         for symbol, data in market_data.items():
+            timestamp = formatted_timestamps.get(data.timestamp)
+            if timestamp is None:
+                timestamp = datetime.fromtimestamp(data.timestamp / 1000).strftime("%Y-%m-%d %H:%M:%S UTC")
+                formatted_timestamps[data.timestamp] = timestamp
             prepared_data[symbol] = {
                 "symbol": data.symbol,
                 "current_price": data.price,
                 "price_change_24h": f"{data.price_change_24h:+.2f}%",
                 "volume_24h": data.volume_24h,
-                "timestamp": datetime.fromtimestamp(data.timestamp / 1000).strftime("%Y-%m-%d %H:%M:%S UTC")
+                "timestamp": timestamp
             }
         return prepared_data
 
     def handle_processing_errors(self, error: Exception, market_data: Optional[Dict[str, MarketDataResponse]] = None) -> str:
-        return f"AI processing failed: {str(error)}"
+        """
+        Log a failed AI call and fall back to the raw market data, when there is any.
+        """
+        logger.log_error(error, {
+            "operation": "handle_processing_errors",
+            "symbols_count": len(market_data) if market_data else 0
+        })
+
+        response = f"AI processing failed: {str(error)}"
+        if market_data:
+            lines = [
+                f"{data.symbol}: ${data.price:,.2f} ({data.price_change_24h:+.2f}% 24h)"
+                for data in market_data.values()
+            ]
+            response += "\n\nLatest market data:\n" + "\n".join(lines)
+        return response
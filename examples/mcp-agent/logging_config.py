@@ -3,23 +3,72 @@ Centralized logging configuration for MCP Market Data Agent.
 Provides structured logging with appropriate severity levels and context details.
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 import os
 import json
+import locale
+import threading
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Treat naive datetimes in log context as UTC and emit them with a trailing "Z"
+_ORJSON_OPTIONS = (orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if HAS_ORJSON else 0
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values the stdlib encoder cannot handle (orjson does these natively)"""
+    if isinstance(obj, datetime):
+        return obj.isoformat() + "Z"
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(obj: Dict[str, Any]) -> str:
+    """Serialize a log entry to a JSON string, using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode()
+    return json.dumps(obj, default=_json_default)
+
 class StructuredFormatter(logging.Formatter):
     """
     Custom formatter that outputs structured log messages with context.
     """
-    
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (epoch second, formatted prefix) of the most recent record
+        self._cached_second = (None, "")
+
+    def _format_timestamp(self, created: float) -> str:
+        """Render record.created as ISO-8601 UTC, reusing the seconds prefix across records"""
+        second = int(created)
+        cached_second, prefix = self._cached_second
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._cached_second = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1000000):06d}Z"
+
     def format(self, record):
-        # Create structured log entry
+        # Reuse the JSON already produced for this record by another handler
+        cached = getattr(record, "_structured_json", None)
+        if cached is not None:
+            return cached
+        
+        record._structured_json = _dumps(self.build_entry(record))
+        return record._structured_json
+    
+    def build_entry(self, record) -> Dict[str, Any]:
+        """Build the structured log entry for a record, before JSON serialization"""
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self._format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -48,24 +97,170 @@ class StructuredFormatter(logging.Formatter):
         if hasattr(record, 'a2a_context'):
             log_entry["a2a_context"] = record.a2a_context
         
-        return json.dumps(log_entry)
+        return log_entry
+
+# Shared by every MCPLogger handler; all formatting happens on the listener thread
+_FORMATTER = StructuredFormatter()
+
+class CountingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    RotatingFileHandler that tracks the file size in memory.
+    The stock handler formats each record twice and seeks/tells the stream on every emit
+    to decide whether to roll over; this one formats once and keeps a byte count instead.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        # Size is only read from disk here; afterwards it is counted
+        self._bytes_written = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        # Never roll over anything other than a regular file (bpo-45401)
+        self._can_rollover = not os.path.exists(self.baseFilename) or os.path.isfile(self.baseFilename)
+        # Count what the file stream writes: encoded bytes, not characters. Without an
+        # explicit encoding, FileHandler stores None or "locale" (3.10+); both mean the
+        # locale encoding the stream is opened with, which str.encode cannot look up by name
+        if self.encoding in (None, "locale"):
+            self._count_encoding = locale.getpreferredencoding(False)
+        else:
+            self._count_encoding = self.encoding
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self._count_encoding, self.errors or "strict"))
+            if self._can_rollover and self.maxBytes > 0 and self._bytes_written + size >= self.maxBytes:
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self.flush()
+            self._bytes_written += size
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self._bytes_written = 0
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for the shared in-process queue.
+    Each record is queued with the handlers of the MCPLogger that produced it.
+    """
+
+    def __init__(self, log_queue, handlers):
+        super().__init__(log_queue)
+        self.targets = tuple(handlers)
+
+    def prepare(self, record):
+        # Merge args into the message now, since mutable args could change before the
+        # listener formats the record. Unlike the stock prepare(), exc_info and the
+        # context attributes are kept so StructuredFormatter sees every field
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        self.queue.put_nowait((record, self.targets))
+
+class _DispatchingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that passes each record to the handlers it was queued with.
+    """
+
+    def handle(self, item):
+        record, handlers = item
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+# One queue and listener thread per process, shared by every MCPLogger
+_QUEUE = queue.Queue()
+_listener: Optional[_DispatchingQueueListener] = None
+_listener_lock = threading.Lock()
+
+def _start_listener():
+    """Start the shared listener thread if it is not running yet"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = _DispatchingQueueListener(_QUEUE)
+            _listener.start()
+            atexit.register(_stop_listener)
+
+def _stop_listener():
+    """Write every queued record and stop the shared listener thread"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
 
 class MCPLogger:
     """
     Centralized logger for MCP Market Data Agent with context-aware logging.
+    Records are enqueued on the calling thread and written by a background listener.
     """
+
+    # Active MCPLogger per logger name
+    _active: Dict[str, "MCPLogger"] = {}
+    
+    # Context skeletons copied per record; keys are listed in output order
+    _PAYMENT_CTX_TEMPLATE = {
+        "event_type": "payment_verification",
+        "success": None,
+        "payment_token_present": False,
+        "verification_method": "local_signature"
+    }
+    _API_CTX_TEMPLATE = {
+        "event_type": "api_request",
+        "success": None,
+        "endpoint": None,
+        "method": "GET",
+        "symbols": None,
+        "attempt_number": 1
+    }
+    _A2A_CTX_TEMPLATE = {
+        "event_type": "a2a_communication",
+        "success": None,
+        "direction": None,
+        "action": None,
+        "from_agent": None,
+        "to_agent": None,
+        "message_id": None
+    }
+    _INIT_CTX_TEMPLATE = {
+        "event_type": "service_initialization",
+        "service": None,
+        "success": None
+    }
+    _PERF_CTX_TEMPLATE = {
+        "event_type": "performance_metric",
+        "operation": None,
+        "duration_ms": None
+    }
+    _ERROR_CTX_TEMPLATE = {
+        "event_type": "error",
+        "error_type": None,
+        "error_message": None
+    }
     
     def __init__(self, name: str, log_level: str = "INFO", log_file: Optional[str] = None):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, log_level.upper()))
         
-        # Clear any existing handlers
+        # Close any previous MCPLogger for this name, then clear its handlers
+        previous = MCPLogger._active.get(name)
+        if previous is not None:
+            previous.close()
         self.logger.handlers.clear()
         
         # Console handler with structured formatting
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(StructuredFormatter())
-        self.logger.addHandler(console_handler)
+        console_handler.setFormatter(_FORMATTER)
+        handlers = [console_handler]
+        file_error = None
         
         # File handler if specified
         if log_file:
@@ -76,19 +271,51 @@ class MCPLogger:
                     os.makedirs(log_dir)
                 
                 # Rotating file handler to prevent large log files
-                file_handler = logging.handlers.RotatingFileHandler(
+                file_handler = CountingRotatingFileHandler(
                     log_file, 
                     maxBytes=10*1024*1024,  # 10MB
-                    backupCount=5
+                    backupCount=5,
+                    encoding="utf-8"
                 )
-                file_handler.setFormatter(StructuredFormatter())
-                self.logger.addHandler(file_handler)
+                file_handler.setFormatter(_FORMATTER)
+                handlers.append(file_handler)
                 
             except Exception as e:
-                self.logger.error(f"Failed to setup file logging: {e}")
+                file_error = e
+        
+        # Real handlers run on the shared listener thread; callers only pay for an enqueue
+        self._handlers = handlers
+        self._queue_handler = _InProcessQueueHandler(_QUEUE, handlers)
+        self.logger.addHandler(self._queue_handler)
+        _start_listener()
+        self._closed = False
+        MCPLogger._active[name] = self
+        
+        if file_error is not None:
+            self.logger.error(f"Failed to setup file logging: {file_error}")
+    
+    def flush(self):
+        """Block until every record queued so far has been written by the handlers"""
+        if _listener is not None:
+            _QUEUE.join()
+    
+    def close(self):
+        """Stop queueing records, write the ones already queued and close the handlers"""
+        if self._closed:
+            return
+        self._closed = True
+        if MCPLogger._active.get(self.logger.name) is self:
+            del MCPLogger._active[self.logger.name]
+        self.logger.removeHandler(self._queue_handler)
+        self.flush()
+        for handler in self._handlers:
+            handler.close()
     
     def log_system_startup(self, config_details: Dict[str, Any]):
         """Log system startup with configuration details (without sensitive info)"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         startup_context = {
             "event_type": "system_startup",
             "agent_id": config_details.get("agent_id"),
@@ -116,9 +343,11 @@ class MCPLogger:
     
     def log_system_shutdown(self, shutdown_details: Dict[str, Any] = None):
         """Log system shutdown with cleanup details"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         shutdown_context = {
-            "event_type": "system_shutdown",
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+            "event_type": "system_shutdown"
         }
         
         if shutdown_details:
@@ -131,13 +360,13 @@ class MCPLogger:
     
     def log_payment_verification(self, success: bool, payment_details: Dict[str, Any], error_details: Optional[Dict[str, Any]] = None):
         """Log payment verification attempts with context"""
-        payment_context = {
-            "event_type": "payment_verification",
-            "success": success,
-            "payment_token_present": payment_details.get("token_present", False),
-            "verification_method": payment_details.get("method", "local_signature"),
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
+        if not self.logger.isEnabledFor(logging.INFO if success else logging.WARNING):
+            return
+        
+        payment_context = self._PAYMENT_CTX_TEMPLATE.copy()
+        payment_context["success"] = success
+        payment_context["payment_token_present"] = payment_details.get("token_present", False)
+        payment_context["verification_method"] = payment_details.get("method", "local_signature")
         
         if error_details:
             payment_context["error_details"] = error_details
@@ -155,15 +384,15 @@ class MCPLogger:
     
     def log_api_request(self, success: bool, request_details: Dict[str, Any], response_details: Optional[Dict[str, Any]] = None, error_details: Optional[Dict[str, Any]] = None):
         """Log API requests with comprehensive context"""
-        api_context = {
-            "event_type": "api_request",
-            "success": success,
-            "endpoint": request_details.get("endpoint"),
-            "method": request_details.get("method", "GET"),
-            "symbols": request_details.get("symbols"),
-            "attempt_number": request_details.get("attempt", 1),
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
+        if not self.logger.isEnabledFor(logging.INFO if success else logging.ERROR):
+            return
+        
+        api_context = self._API_CTX_TEMPLATE.copy()
+        api_context["success"] = success
+        api_context["endpoint"] = request_details.get("endpoint")
+        api_context["method"] = request_details.get("method", "GET")
+        api_context["symbols"] = request_details.get("symbols")
+        api_context["attempt_number"] = request_details.get("attempt", 1)
         
         if response_details:
             api_context["response"] = {
@@ -192,16 +421,16 @@ class MCPLogger:
     
     def log_a2a_communication(self, success: bool, message_details: Dict[str, Any], error_details: Optional[Dict[str, Any]] = None):
         """Log A2A communication events with message context"""
-        a2a_context = {
-            "event_type": "a2a_communication",
-            "success": success,
-            "direction": message_details.get("direction"),  # "send" or "receive"
-            "action": message_details.get("action"),
-            "from_agent": message_details.get("from_agent"),
-            "to_agent": message_details.get("to_agent"),
-            "message_id": message_details.get("message_id"),
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
+        if not self.logger.isEnabledFor(logging.INFO if success else logging.ERROR):
+            return
+        
+        a2a_context = self._A2A_CTX_TEMPLATE.copy()
+        a2a_context["success"] = success
+        a2a_context["direction"] = message_details.get("direction")  # "send" or "receive"
+        a2a_context["action"] = message_details.get("action")
+        a2a_context["from_agent"] = message_details.get("from_agent")
+        a2a_context["to_agent"] = message_details.get("to_agent")
+        a2a_context["message_id"] = message_details.get("message_id")
         
         if error_details:
             a2a_context["error"] = {
@@ -223,12 +452,12 @@ class MCPLogger:
     
     def log_service_initialization(self, service_name: str, success: bool, details: Dict[str, Any] = None, error: Optional[Exception] = None):
         """Log service initialization events"""
-        init_context = {
-            "event_type": "service_initialization",
-            "service": service_name,
-            "success": success,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
+        if not self.logger.isEnabledFor(logging.INFO if success else logging.ERROR):
+            return
+        
+        init_context = self._INIT_CTX_TEMPLATE.copy()
+        init_context["service"] = service_name
+        init_context["success"] = success
         
         if details:
             init_context["details"] = details
@@ -248,12 +477,12 @@ class MCPLogger:
     
     def log_processing_performance(self, operation: str, duration_ms: int, details: Dict[str, Any] = None):
         """Log performance metrics for operations"""
-        perf_context = {
-            "event_type": "performance_metric",
-            "operation": operation,
-            "duration_ms": duration_ms,
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
+        if not self.logger.isEnabledFor(logging.WARNING if duration_ms > 5000 else logging.INFO):
+            return
+        
+        perf_context = self._PERF_CTX_TEMPLATE.copy()
+        perf_context["operation"] = operation
+        perf_context["duration_ms"] = duration_ms
         
         if details:
             perf_context["details"] = details
@@ -272,12 +501,13 @@ class MCPLogger:
     
     def log_error(self, error: Exception, context: Dict[str, Any] = None, severity: str = "ERROR"):
         """Log errors with full context and stack trace"""
-        error_context = {
-            "event_type": "error",
-            "error_type": type(error).__name__,
-            "error_message": str(error),
-            "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
+        level = logging.getLevelName(severity.upper())
+        if not self.logger.isEnabledFor(level if isinstance(level, int) else logging.ERROR):
+            return
+        
+        error_context = self._ERROR_CTX_TEMPLATE.copy()
+        error_context["error_type"] = type(error).__name__
+        error_context["error_message"] = str(error)
         
         if context:
             error_context["context"] = context
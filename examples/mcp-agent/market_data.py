@@ -3,12 +3,38 @@ Market Data Service for MCP API integration.
 Handles API requests, response parsing, and error handling.
 """
 
+import array
+import asyncio
+import functools
+import itertools
 import requests
 import logging
+import random
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Iterator, Sequence, Union
 from dataclasses import dataclass
-from requests.exceptions import Timeout, RequestException
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from requests.exceptions import Timeout, RequestException, ReadTimeout, ChunkedEncodingError, ContentDecodingError
+from urllib3.exceptions import ReadTimeoutError, ProtocolError, DecodeError
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 try:
     from .config import MCPConfig
@@ -19,9 +45,28 @@ except ImportError:
 
 logger = get_logger(__name__)
 
-@dataclass
+# Fields every symbol entry in an MCP response must carry
+_REQUIRED_FIELDS = ("symbol", "price", "timestamp")
+_REQUIRED_FIELD_SET = frozenset(_REQUIRED_FIELDS)
+
+# Response headers worth recording when logging an API error
+_LOGGED_ERROR_HEADERS = ("Content-Type", "X-Request-ID", "Retry-After", "X-RateLimit-Remaining")
+
+# Jittered exponential retry backoff: base delay in seconds and upper bound
+_RETRY_BACKOFF_BASE = 0.1
+_RETRY_BACKOFF_MAX = 30.0
+
+# Error messages for specific MCP API status codes; 5xx is handled separately
+_STATUS_TO_ERROR: Dict[int, str] = {
+    401: "Authentication failed - check API key",
+    403: "Access forbidden - insufficient permissions",
+    404: "API endpoint not found",
+    429: "Rate limit exceeded - too many requests"
+}
+
+@dataclass(slots=True, frozen=True)
 class MarketDataResponse:
-    """Structured market data response"""
+    """Structured market data response (slotted and immutable, one per symbol)"""
     symbol: str
     price: float
     timestamp: int
@@ -29,6 +74,53 @@ class MarketDataResponse:
     volume_24h: float
     price_change_24h: float
 
+@dataclass
+class MarketDataBatch:
+    """
+    Column-oriented (struct-of-arrays) market data for numeric work across symbols.
+    Numeric columns are numpy arrays when numpy is installed, otherwise array.array.
+    """
+    keys: List[str]
+    symbols: List[str]
+    prices: Union["np.ndarray", array.array]
+    timestamps: Union["np.ndarray", array.array]
+    volumes: Union["np.ndarray", array.array]
+    changes: Union["np.ndarray", array.array]
+    depths: List[Dict[str, Any]]
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+
+def _float_array(values: Sequence[float]) -> Union["np.ndarray", array.array]:
+    """Pack floats into a contiguous float64 column"""
+    if HAS_NUMPY:
+        return np.asarray(values, dtype=np.float64)
+    return array.array('d', values)
+
+def _int_array(values: Sequence[int]) -> Union["np.ndarray", array.array]:
+    """Pack integer timestamps into a contiguous int64 column"""
+    if HAS_NUMPY:
+        return np.asarray(values, dtype=np.int64)
+    return array.array('q', values)
+
+@functools.lru_cache(maxsize=32)
+def _symbols_csv(symbols: Tuple[str, ...]) -> str:
+    """Comma-join a symbol set once; polling the same symbols hits the cache"""
+    return ','.join(symbols)
+
+class _PrefixedReader:
+    """File-like reader that returns bytes already read from a stream before the rest of it"""
+    def __init__(self, prefix: bytes, stream: Any):
+        self._prefix = prefix
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to tell bytes from str; that must not consume the prefix
+        if self._prefix and size != 0:
+            prefix, self._prefix = self._prefix, b""
+            return prefix
+        return self._stream.read(size)
+
 class MCPAPIError(Exception):
     """Custom exception for MCP API errors"""
     def __init__(self, message: str, status_code: Optional[int] = None):
@@ -43,11 +135,24 @@ class MarketDataService:
         self.config = mcp_config
         self.session = requests.Session()
         
+        # Keep a pool of kept-alive connections to the MCP host so concurrent
+        # fetches and retries skip the TCP/TLS handshake; retries are handled below
+        endpoint = urlparse(self.config.api_endpoint)
+        self.session.mount(
+            f"{endpoint.scheme}://{endpoint.netloc}",
+            HTTPAdapter(
+                pool_connections=self.config.connection_pool_size,
+                pool_maxsize=self.config.connection_pool_size,
+                max_retries=0
+            )
+        )
+        
         # Set default headers
         self.session.headers.update({
             "Content-Type": "application/json",
             "Accept": "application/json, text/event-stream",
-            "User-Agent": "mcp-market-data-agent/1.0"
+            "User-Agent": "mcp-market-data-agent/1.0",
+            "Connection": "keep-alive"
         })
         
         if self.config.api_key:
@@ -72,13 +177,30 @@ class MarketDataService:
         Raises:
             MCPAPIError: If API request fails after retries
         """
+        # Callers of the raw data only need it validated; skip building objects
+        response_data, _ = self._fetch_and_parse(symbols, build=False)
+        return response_data
+    
+    def _fetch_and_parse(self, symbols: Optional[List[str]], stream: bool = False, build: bool = True) -> Tuple[Optional[Dict[str, Any]], Dict[str, MarketDataResponse]]:
+        """
+        Fetch market data and validate/parse it in a single pass.
+        
+        Args:
+            symbols: List of symbols to fetch data for
+            stream: Parse the response body incrementally; the raw data is then not kept
+            build: Build MarketDataResponse objects; when False the response is only validated
+        
+        Returns:
+            Tuple of (raw response data or None when streamed, parsed MarketDataResponse objects
+            keyed by symbol, empty when build is False)
+        """
         start_time = time.time()
         
         try:
             # Prepare request parameters
             params = {}
             if symbols:
-                params['symbols'] = ','.join(symbols)
+                params['symbols'] = _symbols_csv(tuple(symbols))
             
             request_details = {
                 "endpoint": self.config.api_endpoint,
@@ -90,20 +212,29 @@ class MarketDataService:
             logger.logger.info(f"Fetching market data for symbols: {symbols or 'default'}")
             
             # Make API request with retry logic
-            response_data = self._make_api_request_with_retry(params)
-            
-            # Validate response format
-            self._validate_response_format(response_data)
+            if stream:
+                # Objects are built while the body is read; no intermediate dict
+                response_data = None
+                parsed_data, status_code = self._make_api_request_with_retry(params, stream=True)
+            else:
+                response_data, status_code = self._make_api_request_with_retry(params)
+                
+                if build:
+                    # Validate and parse response in one pass
+                    parsed_data = self._parse_and_validate(response_data)
+                else:
+                    self._validate_response_format(response_data)
+                    parsed_data = {}
             
             # Log successful API request
             response_time = int((time.time() - start_time) * 1000)
             logger.log_api_request(True, request_details, {
-                "status_code": 200,
+                "status_code": status_code,
                 "response_time_ms": response_time,
-                "data_count": len(response_data)
+                "data_count": len(parsed_data) if build else len(response_data)
             })
             
-            return response_data
+            return response_data, parsed_data
             
         except MCPAPIError as e:
             # Log API error with context
@@ -132,15 +263,17 @@ class MarketDataService:
             logger.log_error(e, {"operation": "fetch_market_data", "symbols": symbols})
             raise MCPAPIError(f"Market data fetch failed: {str(e)}")
     
-    def _make_api_request_with_retry(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _make_api_request_with_retry(self, params: Dict[str, Any], stream: bool = False) -> Tuple[Dict[str, Any], int]:
         """
         Make API request with timeout and retry logic.
         
         Args:
             params: Request parameters
+            stream: Stream the body through ijson into MarketDataResponse objects
             
         Returns:
-            Parsed JSON response data
+            Tuple of (parsed JSON response data, or MarketDataResponse objects keyed by symbol
+            when streaming; HTTP status code). A 2xx without a body yields empty data.
             
         Raises:
             MCPAPIError: If request fails after all retries
@@ -158,7 +291,8 @@ class MarketDataService:
                 response = self.session.post(
                     self.config.api_endpoint,
                     json=params,
-                    timeout=self.config.timeout_seconds
+                    timeout=self.config.timeout_seconds,
+                    stream=stream
                 )
                 
                 response_time = int((time.time() - request_start) * 1000)
@@ -176,8 +310,19 @@ class MarketDataService:
                     "response_time_ms": response_time
                 })
                 
-                # Parse and return response
-                return response.json()
+                # A 2xx without a body (e.g. 204 No Content) carries no market data
+                if response.status_code == 204 or (not stream and not response.content):
+                    if stream:
+                        response.close()
+                    return {}, response.status_code
+                
+                if stream:
+                    return self._stream_parse(response), response.status_code
+                
+                # Parse and return response (orjson decodes the raw body directly)
+                if HAS_ORJSON:
+                    return orjson.loads(response.content), response.status_code
+                return response.json(), response.status_code
                 
             except Timeout as e:
                 last_exception = e
@@ -196,7 +341,8 @@ class MarketDataService:
                 
                 # Don't retry on the last attempt
                 if attempt < self.config.retry_attempts:
-                    time.sleep(1)  # Brief delay before retry
+                    # Full-jitter exponential backoff so clients don't retry in lockstep
+                    time.sleep(min(_RETRY_BACKOFF_MAX, random.uniform(0, _RETRY_BACKOFF_BASE * (2 ** attempt))))
                     continue
                     
             except MCPAPIError as e:
@@ -252,9 +398,106 @@ class MarketDataService:
         # If we get here, all retries failed
         raise MCPAPIError(f"API request failed after {attempts_made} attempts: {last_exception}")
     
+    def _iter_validated_rows(self, response_data: Dict[str, Any], build: bool = True) -> Iterator[Tuple[str, str, float, int, Dict[str, Any], float, float]]:
+        """
+        Validate the API response in a single pass, yielding one typed row per symbol.
+        
+        Rows are (key, symbol, price, timestamp, market_depth, volume_24h, price_change_24h).
+        Every entry is checked before raising, so the error lists all invalid symbols.
+        With build=False nothing is yielded and only the response format is checked.
+        
+        Raises:
+            MCPAPIError: If response format is invalid (after the last row)
+        """
+        if not isinstance(response_data, dict):
+            raise MCPAPIError("API response must be a dictionary")
+        
+        # Check if response contains market data
+        if not response_data:
+            logger.logger.warning("API returned empty response")
+            return
+        
+        yield from self._iter_validated_items(response_data.items(), response_data.keys(), build)
+    
+    def _iter_validated_items(self, items: Iterable[Tuple[str, Any]], response_symbols: Iterable[str], build: bool = True) -> Iterator[Tuple[str, str, float, int, Dict[str, Any], float, float]]:
+        """
+        Validate (symbol, data) pairs and yield typed rows; see _iter_validated_rows.
+        
+        Only symbol, price and timestamp are validated. The optional numeric fields
+        are converted when rows are built, and a bad value there is a parsing error.
+        
+        Args:
+            items: (symbol, data) pairs from a decoded or streamed response
+            response_symbols: Symbols reported in the validation error log
+            build: Convert and yield rows; when False the pairs are only validated
+        """
+        validation_errors = []
+        parse_error = None
+        
+        # Bind globals/builtins used per symbol to locals for the hot loop
+        _float = float
+        _int = int
+        _dict = dict
+        _required = _REQUIRED_FIELD_SET
+        add_error = validation_errors.append
+        
+        for symbol, data in items:
+            if not isinstance(data, _dict):
+                add_error(f"Invalid data format for symbol {symbol}")
+                continue
+            
+            if not _required.issubset(data):
+                missing_fields = [field for field in _REQUIRED_FIELDS if field not in data]
+                add_error(f"Missing required fields for {symbol}: {missing_fields}")
+                continue
+            
+            # Validate data types of the required fields
+            try:
+                price = _float(data["price"])
+                timestamp = _int(data["timestamp"])
+            except (ValueError, TypeError) as e:
+                add_error(f"Invalid data types for {symbol}: {e}")
+                continue
+            
+            if not build or validation_errors or parse_error is not None:
+                continue
+            
+            # Extract optional fields with defaults
+            get = data.get
+            try:
+                volume_24h = _float(get("volume_24h", 0.0))
+                price_change_24h = _float(get("price_change_24h", 0.0))
+            except (ValueError, TypeError) as e:
+                parse_error = e
+                continue
+            yield (
+                symbol,
+                data["symbol"],
+                price,
+                timestamp,
+                get("market_depth", {"bids": [], "asks": []}),
+                volume_24h,
+                price_change_24h
+            )
+        
+        if validation_errors:
+            logger.log_error(Exception("Response validation failed"), {
+                "operation": "response_validation",
+                "validation_errors": validation_errors,
+                "response_symbols": list(response_symbols)
+            })
+            raise MCPAPIError(f"Response validation failed: {'; '.join(validation_errors)}")
+        
+        if parse_error is not None:
+            logger.log_error(parse_error, {
+                "operation": "response_parsing",
+                "response_symbols": list(response_symbols)
+            })
+            raise MCPAPIError(f"Response parsing failed: {parse_error}")
+    
     def _validate_response_format(self, response_data: Dict[str, Any]) -> None:
         """
-        Validate that the API response has the expected format.
+        Validate that the API response has the expected format, without building objects.
         
         Args:
             response_data: The parsed JSON response from the API
@@ -263,85 +506,153 @@ class MarketDataService:
             MCPAPIError: If response format is invalid
         """
         try:
-            if not isinstance(response_data, dict):
-                raise MCPAPIError("API response must be a dictionary")
+            for _ in self._iter_validated_rows(response_data, build=False):
+                pass
+        except MCPAPIError:
+            raise
+        except Exception as e:
+            logger.log_error(e, {"operation": "response_validation"})
+            raise MCPAPIError(f"Response validation error: {str(e)}")
+    
+    def _parse_and_validate(self, response_data: Dict[str, Any]) -> Dict[str, MarketDataResponse]:
+        """
+        Validate the API response format and parse it into structured objects in one pass.
+        
+        Args:
+            response_data: The parsed JSON response from the API
             
-            # Check if response contains market data
-            if not response_data:
-                logger.logger.warning("API returned empty response")
-                return
+        Returns:
+            Dictionary of MarketDataResponse objects keyed by symbol
             
-            # Validate each symbol's data structure
-            validation_errors = []
-            for symbol, data in response_data.items():
-                if not isinstance(data, dict):
-                    validation_errors.append(f"Invalid data format for symbol {symbol}")
-                    continue
-                
-                required_fields = ['symbol', 'price', 'timestamp']
-                missing_fields = [field for field in required_fields if field not in data]
-                
-                if missing_fields:
-                    validation_errors.append(f"Missing required fields for {symbol}: {missing_fields}")
-                    continue
-                
-                # Validate data types
-                try:
-                    float(data['price'])
-                    int(data['timestamp'])
-                except (ValueError, TypeError) as e:
-                    validation_errors.append(f"Invalid data types for {symbol}: {e}")
+        Raises:
+            MCPAPIError: If response format is invalid
+        """
+        try:
+            _MDR = MarketDataResponse
+            return {row[0]: _MDR(*row[1:]) for row in self._iter_validated_rows(response_data)}
+        except MCPAPIError:
+            raise
+        except Exception as e:
+            logger.log_error(e, {"operation": "response_validation"})
+            raise MCPAPIError(f"Response validation error: {str(e)}")
+    
+    def _stream_parse(self, response: requests.Response) -> Dict[str, MarketDataResponse]:
+        """
+        Parse a streamed response body into MarketDataResponse objects as it is read,
+        without materializing the decoded JSON document.
+        
+        Args:
+            response: A response requested with stream=True
             
-            if validation_errors:
-                logger.log_error(Exception("Response validation failed"), {
-                    "operation": "response_validation",
-                    "validation_errors": validation_errors,
-                    "response_symbols": list(response_data.keys())
-                })
-                raise MCPAPIError(f"Response validation failed: {'; '.join(validation_errors)}")
-                
+        Returns:
+            Dictionary of MarketDataResponse objects keyed by symbol
+            
+        Raises:
+            MCPAPIError: If response format is invalid
+            RequestException: If reading the body fails; read timeouts raise Timeout
+        """
+        seen_symbols = []
+        
+        def items(body):
+            events = ijson.parse(body, use_float=True)
+            first = next(events, None)
+            if first is None or first[1] != 'start_map':
+                raise MCPAPIError("API response must be a dictionary")
+            for symbol, data in ijson.kvitems(itertools.chain((first,), events), ''):
+                seen_symbols.append(symbol)
+                yield symbol, data
+        
+        try:
+            # Let urllib3 undo any Content-Encoding before ijson reads the bytes
+            response.raw.decode_content = True
+            # A 2xx with an empty body carries no market data, as on the non-streamed path;
+            # the peeked byte is handed back to ijson ahead of the rest of the body
+            head = response.raw.read(1)
+            if not head:
+                parsed_data = {}
+            else:
+                _MDR = MarketDataResponse
+                body = _PrefixedReader(head, response.raw)
+                parsed_data = {row[0]: _MDR(*row[1:]) for row in self._iter_validated_items(items(body), seen_symbols)}
         except MCPAPIError:
             raise
+        # Read errors come straight from urllib3 when reading response.raw; map them the
+        # way requests does for non-streamed bodies so the retry loop handles them
+        except ReadTimeoutError as e:
+            raise ReadTimeout(e, response=response)
+        except ProtocolError as e:
+            raise ChunkedEncodingError(e, response=response)
+        except DecodeError as e:
+            raise ContentDecodingError(e, response=response)
         except Exception as e:
             logger.log_error(e, {"operation": "response_validation"})
             raise MCPAPIError(f"Response validation error: {str(e)}")
+        finally:
+            # Return the connection to the pool
+            response.close()
+        
+        if not parsed_data:
+            logger.logger.warning("API returned empty response")
+        return parsed_data
     
-    def parse_response(self, response_data: Dict[str, Any]) -> Dict[str, MarketDataResponse]:
+    def parse_response_soa(self, response_data: Dict[str, Any]) -> MarketDataBatch:
         """
-        Parse and validate MCP API response into structured objects.
+        Parse and validate MCP API response into a single column-oriented batch.
         
         Args:
             response_data: Raw API response data
             
         Returns:
-            Dictionary of MarketDataResponse objects keyed by symbol
+            MarketDataBatch with one array per numeric field, in response order
             
         Raises:
             MCPAPIError: If parsing fails
         """
+        keys, symbols, prices, timestamps, depths, volumes, changes = [], [], [], [], [], [], []
         try:
-            parsed_data = {}
-            
-            for symbol, data in response_data.items():
-                # Extract required fields with defaults for optional ones
-                parsed_data[symbol] = MarketDataResponse(
-                    symbol=data["symbol"],
-                    price=float(data["price"]),
-                    timestamp=int(data["timestamp"]),
-                    market_depth=data.get("market_depth", {"bids": [], "asks": []}),
-                    volume_24h=float(data.get("volume_24h", 0.0)),
-                    price_change_24h=float(data.get("price_change_24h", 0.0))
-                )
+            for row in self._iter_validated_rows(response_data):
+                keys.append(row[0])
+                symbols.append(row[1])
+                prices.append(row[2])
+                timestamps.append(row[3])
+                depths.append(row[4])
+                volumes.append(row[5])
+                changes.append(row[6])
+        except MCPAPIError:
+            raise
+        except Exception as e:
+            logger.log_error(e, {"operation": "response_validation"})
+            raise MCPAPIError(f"Response validation error: {str(e)}")
+        
+        batch = MarketDataBatch(
+            keys=keys,
+            symbols=symbols,
+            prices=_float_array(prices),
+            timestamps=_int_array(timestamps),
+            volumes=_float_array(volumes),
+            changes=_float_array(changes),
+            depths=depths
+        )
+        logger.logger.info(f"Successfully parsed market data batch for {len(batch)} symbols")
+        return batch
+    
+    
+    def parse_response(self, response_data: Dict[str, Any]) -> Dict[str, MarketDataResponse]:
+        """
+        Parse and validate MCP API response into structured objects.
+        
+        Args:
+            response_data: Raw API response data
             
-            logger.logger.info(f"Successfully parsed market data for {len(parsed_data)} symbols")
-            return parsed_data
+        Returns:
+            Dictionary of MarketDataResponse objects keyed by symbol
             
-        except Exception as e:
-            logger.log_error(e, {
-                "operation": "response_parsing",
-                "response_symbols": list(response_data.keys()) if isinstance(response_data, dict) else None
-            })
-            raise MCPAPIError(f"Response parsing failed: {str(e)}")
+        Raises:
+            MCPAPIError: If parsing fails
+        """
+        parsed_data = self._parse_and_validate(response_data)
+        logger.logger.info(f"Successfully parsed market data for {len(parsed_data)} symbols")
+        return parsed_data
     
     def handle_api_errors(self, response: requests.Response) -> None:
         """
@@ -353,45 +664,44 @@ class MarketDataService:
         Raises:
             MCPAPIError: For various API error conditions
         """
-        if response.status_code == 200:
+        # Any 2xx is a success
+        if 200 <= response.status_code < 300:
             return
         
-        # Extract error details for logging
-        error_msg = f"MCP API error: {response.status_code}"
-        error_details = {
-            "status_code": response.status_code,
-            "url": response.url,
-            "headers": dict(response.headers)
-        }
-        
-        try:
-            error_data = response.json()
-            if 'error' in error_data:
-                error_msg += f" - {error_data['error']}"
-                error_details["api_error"] = error_data['error']
-        except:
-            error_msg += f" - {response.text[:200]}"  # Truncate long responses
-            error_details["response_text"] = response.text[:200]
-        
-        # Log the error with context
-        logger.log_error(Exception(error_msg), {
-            "operation": "api_error_handling",
-            "error_details": error_details
-        })
+        # Only read the body and headers when the error log will actually be emitted
+        if logger.logger.isEnabledFor(logging.ERROR):
+            # Extract error details for logging
+            error_msg = f"MCP API error: {response.status_code}"
+            headers = response.headers
+            error_details = {
+                "status_code": response.status_code,
+                "url": response.url,
+                "headers": {name: headers[name] for name in _LOGGED_ERROR_HEADERS if name in headers}
+            }
+            
+            try:
+                error_data = response.json()
+                if 'error' in error_data:
+                    error_msg += f" - {error_data['error']}"
+                    error_details["api_error"] = error_data['error']
+            except:
+                error_msg += f" - {response.text[:200]}"  # Truncate long responses
+                error_details["response_text"] = response.text[:200]
+            
+            # Log the error with context
+            logger.log_error(Exception(error_msg), {
+                "operation": "api_error_handling",
+                "error_details": error_details
+            })
         
         # Raise specific errors based on status code
-        if response.status_code == 401:
-            raise MCPAPIError("Authentication failed - check API key", response.status_code)
-        elif response.status_code == 403:
-            raise MCPAPIError("Access forbidden - insufficient permissions", response.status_code)
-        elif response.status_code == 404:
-            raise MCPAPIError("API endpoint not found", response.status_code)
-        elif response.status_code == 429:
-            raise MCPAPIError("Rate limit exceeded - too many requests", response.status_code)
-        elif response.status_code >= 500:
-            raise MCPAPIError("MCP API server error - service unavailable", response.status_code)
-        else:
-            raise MCPAPIError(f"API request failed with status {response.status_code}", response.status_code)
+        status_code = response.status_code
+        message = _STATUS_TO_ERROR.get(status_code)
+        if message is not None:
+            raise MCPAPIError(message, status_code)
+        if status_code >= 500:
+            raise MCPAPIError("MCP API server error - service unavailable", status_code)
+        raise MCPAPIError(f"API request failed with status {status_code}", status_code)
     
     def get_market_summary(self, symbols: Optional[List[str]] = None) -> Dict[str, MarketDataResponse]:
         """
@@ -403,5 +713,22 @@ class MarketDataService:
         Returns:
             Dictionary of parsed MarketDataResponse objects
         """
-        raw_data = self.fetch_market_data(symbols)
-        return self.parse_response(raw_data)
\ No newline at end of file
+        # Large symbol sets are parsed straight off the socket when ijson is installed
+        stream = HAS_IJSON and symbols is not None and len(symbols) >= self.config.stream_parse_min_symbols
+        _, parsed_data = self._fetch_and_parse(symbols, stream=stream)
+        logger.logger.info(f"Successfully parsed market data for {len(parsed_data)} symbols")
+        return parsed_data
+    
+    async def fetch_market_data_async(self, symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Async variant of fetch_market_data for callers running on the event loop.
+        The request runs in a worker thread and draws from the session's connection pool,
+        so concurrent fetches reuse kept-alive connections instead of blocking the loop.
+        """
+        return await asyncio.to_thread(self.fetch_market_data, symbols)
+    
+    async def get_market_summary_async(self, symbols: Optional[List[str]] = None) -> Dict[str, MarketDataResponse]:
+        """
+        Async variant of get_market_summary.
+        """
+        return await asyncio.to_thread(self.get_market_summary, symbols)
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Persistent prompt-response cache for the CrewAI backend.
+Stores LLM responses in SQLite so identical prompts survive process restarts.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    from .logging_config import get_logger
+except ImportError:
+    from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+class PromptCache:
+    """
+    SQLite-backed prompt-response cache with TTL expiry and LRU eviction.
+    Safe to share between processes; the database runs in WAL mode.
+    Each instance keeps one connection, shared by its threads under a lock.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: int = 60, max_entries: int = 1000):
+        self.db_path = os.path.expanduser(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # Hit times not yet written; get stays read-only and set writes them in one batch
+        self._pending_access: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        # Ensure cache directory exists
+        cache_dir = os.path.dirname(self.db_path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+        # Kickoffs run in worker threads, so the connection is not tied to its creating thread
+        self._conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS prompt_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str) -> str:
+        """Hash a prompt into a fixed-size cache key"""
+        return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, prompt: str) -> Optional[str]:
+        """Return the cached response for a prompt, or None on a miss or expired entry"""
+        key = self.make_key(prompt)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM prompt_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+
+            # Expired rows are left for the next set to purge
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._pending_access[key] = now
+            self.hits += 1
+            return row[0]
+
+    def set(self, prompt: str, response: str) -> None:
+        """Store a response, purge expired entries and evict the least recently used beyond max_entries"""
+        key = self.make_key(prompt)
+        now = time.time()
+
+        with self._lock:
+            self._write_pending_access()
+            self._conn.execute("DELETE FROM prompt_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompt_cache (key, response, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, now + self.ttl_seconds, now),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM prompt_cache WHERE key NOT IN (
+                    SELECT key FROM prompt_cache ORDER BY last_access DESC LIMIT ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def _write_pending_access(self) -> None:
+        # Caller holds the lock and commits
+        if self._pending_access:
+            self._conn.executemany(
+                "UPDATE prompt_cache SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._pending_access.items()],
+            )
+            self._pending_access.clear()
+
+    def clear_cache(self) -> None:
+        """Remove every cached entry and reset hit/miss counters"""
+        with self._lock:
+            self._pending_access.clear()
+            self._conn.execute("DELETE FROM prompt_cache")
+            self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        logger.logger.info(f"Prompt cache cleared: {self.db_path}")
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of unexpired entries and hit/miss counts for this process"""
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM prompt_cache WHERE expires_at > ?",
+                (time.time(),),
+            ).fetchone()[0]
+
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def close(self) -> None:
+        """Write pending access times and close the connection"""
+        with self._lock:
+            self._write_pending_access()
+            self._conn.commit()
+            self._conn.close()
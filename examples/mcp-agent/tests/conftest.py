@@ -0,0 +1,57 @@
+"""
+Shared pytest configuration for the MCP Market Data Agent tests.
+"""
+
+import functools
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the agent modules (config, a2a_handlers, ...) and the orca_agent_sdk package
+# importable once per session instead of from every test module
+_AGENT_DIR = Path(__file__).resolve().parent.parent
+_REPO_ROOT = _AGENT_DIR.parent.parent
+for _path in (str(_REPO_ROOT), str(_AGENT_DIR)):
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_hypothesis_profiles():
+    """Register and load the hypothesis profiles the first time a module needs them"""
+    from hypothesis import HealthCheck, settings
+
+    # "ci" keeps property runs short and reproducible: derandomized, with no example database
+    # for xdist workers to contend over. "dev" uses hypothesis defaults.
+    # Select one with HYPOTHESIS_PROFILE; per-test @settings still override these values.
+    settings.register_profile(
+        "ci", max_examples=25, deadline=None, derandomize=True, database=None,
+        suppress_health_check=list(HealthCheck)
+    )
+    settings.register_profile("dev", deadline=None)
+    settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "ci"))
+
+
+def pytest_collectstart(collector):
+    # Import hypothesis only for modules that use it, before their @given decorators
+    # capture the default settings; plain example-based runs skip its import cost
+    if isinstance(collector, pytest.Module) and "hypothesis" in collector.path.read_text(encoding="utf-8"):
+        _load_hypothesis_profiles()
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "hypothesis: property-based test driven by hypothesis (deselect with -m 'not hypothesis')"
+    )
+    config.addinivalue_line(
+        "markers", "slow: long-running test (deselect with -m 'not slow')"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Tag every @given test so fast and property runs can be split with -m and sharded with -n
+    for item in items:
+        if getattr(getattr(item, "obj", None), "is_hypothesis_test", False) and not item.get_closest_marker("hypothesis"):
+            item.add_marker(pytest.mark.hypothesis)
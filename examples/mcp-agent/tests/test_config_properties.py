@@ -0,0 +1,96 @@
+"""
+Property-based tests for configuration validation.
+Tests SDK integration consistency across generated configuration values.
+"""
+
+import pytest
+import copy
+import os
+import re
+from hypothesis import given, strategies as st
+from unittest.mock import patch
+
+from config import AgentConfiguration
+from orca_agent_sdk.config import AgentConfig
+
+# Strategies are built once at import; regex draws never need rejection filtering
+_ALNUM_ID = re.compile(r"[A-Za-z0-9_-]{1,20}")
+_ALNUM_ADDRESS = re.compile(r"[A-Za-z0-9]{5,20}")
+_CHAIN_CAIP = re.compile(r"eip155:[A-Za-z0-9]{5,20}")
+_API_KEY = re.compile(r"[A-Za-z0-9]{10,50}")
+
+AGENT_ID_ST = st.from_regex(_ALNUM_ID, fullmatch=True)
+PRICE_ST = st.decimals(min_value=0, max_value=100, places=2).map(str)
+TOKEN_ADDRESS_ST = st.from_regex(_ALNUM_ADDRESS, fullmatch=True)
+CHAIN_CAIP_ST = st.from_regex(_CHAIN_CAIP, fullmatch=True)
+API_KEY_ST = st.from_regex(_API_KEY, fullmatch=True)
+
+@pytest.fixture(scope="class")
+def base_config():
+    """Build one environment-driven configuration for every hypothesis example"""
+    with patch.dict(os.environ, {
+        'GEMINI_API_KEY': 'test_gemini_key',
+        'MCP_API_KEY': 'test_mcp_key',
+        'CRONOS_FACILITATOR_URL': 'https://test-facilitator.com',
+        'AGENT_REGISTRY_ENDPOINT': 'https://test-registry.com'
+    }):
+        return AgentConfiguration()
+
+class TestConfigurationValidationProperty:
+    """Property-based tests for SDK integration consistency"""
+    
+    @pytest.mark.hypothesis
+    @given(
+        agent_id=AGENT_ID_ST,
+        price=PRICE_ST,
+        token_address=TOKEN_ADDRESS_ST,
+        chain_caip=CHAIN_CAIP_ST,
+        api_key=API_KEY_ST
+    )
+    def test_sdk_integration_consistency(self, base_config, agent_id, price, token_address, chain_caip, api_key):
+        """
+        **Feature: mcp-market-data-agent, Property 6: SDK integration consistency**
+        For any valid configuration parameters, the system should use 0rca-agent-sdk 
+        methods for payment verification and data persistence rather than custom implementations.
+        **Validates: Requirements 5.2, 5.3**
+        """
+        # Copy the shared configuration and the sub-configs this example mutates
+        config = copy.copy(base_config)
+        config.a2a = copy.copy(base_config.a2a)
+        config.payment = copy.copy(base_config.payment)
+        config.crewai = copy.copy(base_config.crewai)
+        config.a2a.agent_id = agent_id
+        config.payment.price = price
+        config.payment.token_address = token_address
+        config.payment.chain_caip = chain_caip
+        config.crewai.api_key = api_key
+        
+        # Convert to AgentConfig format
+        config_dict = config.to_agent_config_dict()
+        
+        # Verify SDK integration consistency
+        # The configuration should be compatible with AgentConfig
+        try:
+            agent_config = AgentConfig(**config_dict)
+            
+            # Verify that essential SDK fields are properly mapped
+            assert agent_config.agent_id == agent_id
+            assert agent_config.price == price
+            assert agent_config.token_address == token_address
+            assert agent_config.chain_caip == chain_caip
+            assert agent_config.ai_backend == "crewai"
+            
+            # Verify backend options are properly configured
+            assert "provider" in agent_config.backend_options
+            assert "model" in agent_config.backend_options
+            assert "api_key" in agent_config.backend_options
+            assert agent_config.backend_options["api_key"] == api_key
+            
+            # Verify database path follows SDK conventions
+            assert agent_config.db_path == f"{agent_id}.db"
+            
+            # MCP headers follow the mutated agent ID, not the cached base one
+            assert config.get_mcp_headers()["User-Agent"] == f"{agent_id}/1.0"
+            
+        except Exception as e:
+            pytest.fail(f"SDK integration failed with valid configuration: {e}")
@@ -5,22 +5,136 @@ Tests Property 7: Comprehensive error logging
 
 import pytest
 import json
-import tempfile
+import logging
 import os
+import subprocess
+import sys
+import textwrap
+import threading
 import time
+from collections import defaultdict
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from hypothesis import given, strategies as st, settings
 from fastapi.testclient import TestClient
 from requests.exceptions import Timeout, RequestException
 
-import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
-
-from logging_config import get_logger, MCPLogger
+from logging_config import get_logger, MCPLogger, StructuredFormatter, CountingRotatingFileHandler
 from market_data import MCPAPIError, MarketDataService
 from crewai_backend import MCPCrewAIBackend
 from a2a_handlers import A2AHandlers
 
+# Exception classes by name; the error-type strategy draws from these keys
+_EXC_TABLE = {
+    'ValueError': ValueError,
+    'RuntimeError': RuntimeError,
+    'ConnectionError': ConnectionError,
+    'TimeoutError': TimeoutError
+}
+
+# Strategies are built once at import and shared by every @given below
+_SHORT_TEXT = st.text(min_size=1, max_size=20)
+_ERROR_TYPES = st.sampled_from(list(_EXC_TABLE))
+_CONTEXT_DICT = st.dictionaries(
+    _SHORT_TEXT,
+    st.one_of(st.text(max_size=50), st.integers(), st.booleans()),
+    min_size=0, max_size=5
+)
+_AGENT_NAME = st.text(min_size=5, max_size=20)
+
+# For properties over a small enum/boolean input space: a few deterministic examples
+# cover it, with no example database I/O and a tight deadline so slow logging fails
+_SCHEMA_SETTINGS = settings(max_examples=8, deadline=50, database=None, derandomize=True)
+
+class _CaptureHandler(logging.Handler):
+    """Keeps every structured entry MCPLogger emits in memory, on the calling thread"""
+
+    # Entry keys that carry an event_type, in the order StructuredFormatter writes them
+    _CONTEXT_KEYS = ("context", "payment_context", "api_context", "a2a_context")
+
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(StructuredFormatter())
+        # Entries indexed by their context's event_type
+        self.by_event = defaultdict(list)
+
+    def emit(self, record):
+        # Take the entry dict directly; a JSON round-trip would only rebuild it
+        entry = self.formatter.build_entry(record)
+        for key in self._CONTEXT_KEYS:
+            if key in entry:
+                self.by_event[entry[key].get("event_type")].append(entry)
+                break
+
+    def clear(self):
+        self.by_event.clear()
+
+
+# Plain-logging target for _RecordingLogger.logger: enabled at every level, writes nowhere
+_QUIET_LOGGER = logging.getLogger("test_error_logging.recorder")
+_QUIET_LOGGER.setLevel(logging.DEBUG)
+_QUIET_LOGGER.propagate = False
+_QUIET_LOGGER.addHandler(logging.NullHandler())
+
+
+class _RecordingLogger:
+    """Stands in for a module's MCPLogger and records its log_* calls, without Mock's overhead"""
+
+    def __init__(self):
+        self.logger = _QUIET_LOGGER
+        self.calls = []
+
+    def __getattr__(self, name):
+        if not name.startswith("log_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def calls_to(self, name):
+        """(args, kwargs) of every recorded call to the named log_* method"""
+        return [(args, kwargs) for called, args, kwargs in self.calls if called == name]
+
+
+@pytest.fixture(scope="class")
+def mcp_config():
+    """MCP API settings shared by every test in the class"""
+    return SimpleNamespace(
+        api_endpoint="https://test-api.example.com",
+        timeout_seconds=5,
+        retry_attempts=1,
+        api_key="test-key",
+        connection_pool_size=32,
+        stream_parse_min_symbols=500
+    )
+
+
+@pytest.fixture(scope="class")
+def crewai_config():
+    """CrewAI settings shared by every test in the class"""
+    return SimpleNamespace(model="test-model", temperature=0.7, api_key="test-key", processing_timeout=30)
+
+
+@pytest.fixture(scope="class")
+def a2a_config():
+    """A2A settings shared by every test in the class"""
+    return SimpleNamespace(agent_id="test-agent", message_timeout=10, connection_pool_size=10)
+
+
+@pytest.fixture(scope="class")
+def crewai_backend(crewai_config):
+    """One backend per class, with the crewai_backend module logger recorded"""
+    with patch('crewai_backend.logger', _RecordingLogger()) as recorder:
+        yield MCPCrewAIBackend(crewai_config), recorder
+
+
+@pytest.fixture(scope="class")
+def a2a_handlers(a2a_config):
+    """One set of handlers per class over a mock protocol, with the a2a_handlers module logger recorded"""
+    with patch('a2a_handlers.logger', _RecordingLogger()) as recorder:
+        mock_protocol = Mock()
+        mock_protocol.registry = Mock()
+        yield A2AHandlers(mock_protocol, a2a_config), recorder
+
+
 class TestErrorLoggingProperty:
     """
     **Feature: mcp-market-data-agent, Property 7: Comprehensive error logging**
@@ -32,61 +146,32 @@ class TestErrorLoggingProperty:
     """
     
     def setup_method(self):
-        """Set up test environment with temporary log file"""
-        self.temp_log_file = tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.log')
-        self.temp_log_file.close()
-        self.log_file_path = self.temp_log_file.name
-        
-        # Create logger instance for testing
-        self.logger = get_logger("test_logger", "DEBUG", self.log_file_path)
-        
-        # Mock configurations
-        self.mock_mcp_config = Mock()
-        self.mock_mcp_config.api_endpoint = "https://test-api.example.com"
-        self.mock_mcp_config.timeout_seconds = 5
-        self.mock_mcp_config.retry_attempts = 1
-        self.mock_mcp_config.api_key = "test-key"
-        
-        self.mock_crewai_config = Mock()
-        self.mock_crewai_config.model = "test-model"
-        self.mock_crewai_config.temperature = 0.7
-        self.mock_crewai_config.api_key = "test-key"
-        self.mock_crewai_config.processing_timeout = 30
-        
-        self.mock_a2a_config = Mock()
-        self.mock_a2a_config.agent_id = "test-agent"
+        """Set up test environment with an in-memory log capture"""
+        # Create logger instance for testing; entries are asserted from memory, so no log file
+        self.logger = get_logger("test_logger", "DEBUG")
+        
+        # Capture entries on the calling thread, before they are queued for the listener
+        self.capture = _CaptureHandler()
+        self.logger.logger.addHandler(self.capture)
     
     def teardown_method(self):
-        """Clean up temporary log file"""
-        try:
-            os.unlink(self.log_file_path)
-        except:
-            pass
+        """Detach the capture and stop the logger"""
+        self.logger.logger.removeHandler(self.capture)
+        self.logger.close()
     
-    def read_log_entries(self):
-        """Read and parse log entries from the log file"""
-        log_entries = []
-        try:
-            with open(self.log_file_path, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            log_entries.append(json.loads(line.strip()))
-                        except json.JSONDecodeError:
-                            # Skip malformed lines
-                            continue
-        except FileNotFoundError:
-            pass
-        return log_entries
+    def reset_log_entries(self):
+        """Drop entries from earlier examples so each example only scans its own"""
+        self.capture.clear()
+    
+    def latest_entry(self, event_type):
+        """Return the most recent captured entry for event_type, or None"""
+        entries = self.capture.by_event.get(event_type)
+        return entries[-1] if entries else None
     
     @given(
         error_message=st.text(min_size=1, max_size=100),
-        error_type=st.sampled_from(['ValueError', 'RuntimeError', 'ConnectionError', 'TimeoutError']),
-        context_data=st.dictionaries(
-            st.text(min_size=1, max_size=20), 
-            st.one_of(st.text(max_size=50), st.integers(), st.booleans()),
-            min_size=0, max_size=5
-        )
+        error_type=_ERROR_TYPES,
+        context_data=_CONTEXT_DICT
     )
     @settings(max_examples=20)
     def test_error_logging_with_context_property(self, error_message, error_type, context_data):
@@ -100,31 +185,20 @@ class TestErrorLoggingProperty:
         - Appropriate severity level
         - Timestamp
         """
-        # Create an exception of the specified type
-        try:
-            exception_class = getattr(__builtins__, error_type)
-        except (AttributeError, TypeError):
-            exception_class = Exception
+        self.reset_log_entries()
         
-        test_error = exception_class(error_message)
+        # Create an exception of the specified type
+        test_error = _EXC_TABLE[error_type](error_message)
         
         # Log the error with context
         self.logger.log_error(test_error, context_data, "ERROR")
         
-        # Read log entries
-        log_entries = self.read_log_entries()
-        
-        # Verify at least one log entry was created
-        assert len(log_entries) > 0
-        
         # Find the error log entry
-        error_entry = None
-        for entry in log_entries:
-            if entry.get("level") == "ERROR" and error_message in entry.get("message", ""):
-                error_entry = entry
-                break
+        error_entry = self.latest_entry("error")
         
         assert error_entry is not None, f"Error log entry not found for message: {error_message}"
+        assert error_entry["level"] == "ERROR"
+        assert error_message in error_entry["message"]
         
         # Verify required fields are present
         assert "timestamp" in error_entry
@@ -135,8 +209,7 @@ class TestErrorLoggingProperty:
         # Verify error details in context
         context = error_entry["context"]
         assert context["event_type"] == "error"
-        # Use the actual error type from the exception
-        assert context["error_type"] == type(test_error).__name__
+        assert context["error_type"] == error_type
         assert context["error_message"] == error_message
         
         # Verify provided context is included
@@ -159,12 +232,14 @@ class TestErrorLoggingProperty:
             ])
         )
     )
-    @settings(max_examples=20)
+    @_SCHEMA_SETTINGS
     def test_payment_verification_logging_property(self, payment_success, token_present, error_reason):
         """
         Property test for payment verification logging.
         Verifies that payment verification attempts are logged with appropriate context.
         """
+        self.reset_log_entries()
+        
         payment_details = {
             "token_present": token_present,
             "method": "local_signature"
@@ -180,16 +255,8 @@ class TestErrorLoggingProperty:
         # Log payment verification
         self.logger.log_payment_verification(payment_success, payment_details, error_details)
         
-        # Read log entries
-        log_entries = self.read_log_entries()
-        assert len(log_entries) > 0
-        
         # Find the payment log entry
-        payment_entry = None
-        for entry in log_entries:
-            if "payment_context" in entry and entry["payment_context"]["event_type"] == "payment_verification":
-                payment_entry = entry
-                break
+        payment_entry = self.latest_entry("payment_verification")
         
         assert payment_entry is not None
         
@@ -216,6 +283,8 @@ class TestErrorLoggingProperty:
         Property test for API request logging.
         Verifies that API requests are logged with comprehensive context.
         """
+        self.reset_log_entries()
+        
         request_details = {
             "endpoint": endpoint,
             "method": "GET",
@@ -242,16 +311,8 @@ class TestErrorLoggingProperty:
         # Log API request
         self.logger.log_api_request(api_success, request_details, response_details, error_details)
         
-        # Read log entries
-        log_entries = self.read_log_entries()
-        assert len(log_entries) > 0
-        
         # Find the API log entry
-        api_entry = None
-        for entry in log_entries:
-            if "api_context" in entry and entry["api_context"]["event_type"] == "api_request":
-                api_entry = entry
-                break
+        api_entry = self.latest_entry("api_request")
         
         assert api_entry is not None
         
@@ -274,16 +335,18 @@ class TestErrorLoggingProperty:
         a2a_success=st.booleans(),
         direction=st.sampled_from(['send', 'receive']),
         action=st.sampled_from(['ping', 'query_market_data', 'notify', 'status']),
-        from_agent=st.text(min_size=5, max_size=20),
-        to_agent=st.text(min_size=5, max_size=20),
+        from_agent=_AGENT_NAME,
+        to_agent=_AGENT_NAME,
         error_type=st.sampled_from(['validation_error', 'communication_error', 'processing_error'])
     )
-    @settings(max_examples=20)
+    @_SCHEMA_SETTINGS
     def test_a2a_communication_logging_property(self, a2a_success, direction, action, from_agent, to_agent, error_type):
         """
         Property test for A2A communication logging.
         Verifies that A2A communication events are logged with message context.
         """
+        self.reset_log_entries()
+        
         message_details = {
             "direction": direction,
             "action": action,
@@ -303,16 +366,8 @@ class TestErrorLoggingProperty:
         # Log A2A communication
         self.logger.log_a2a_communication(a2a_success, message_details, error_details)
         
-        # Read log entries
-        log_entries = self.read_log_entries()
-        assert len(log_entries) > 0
-        
         # Find the A2A log entry
-        a2a_entry = None
-        for entry in log_entries:
-            if "a2a_context" in entry and entry["a2a_context"]["event_type"] == "a2a_communication":
-                a2a_entry = entry
-                break
+        a2a_entry = self.latest_entry("a2a_communication")
         
         assert a2a_entry is not None
         
@@ -328,41 +383,31 @@ class TestErrorLoggingProperty:
             assert "error" in a2a_context
             assert a2a_context["error"]["type"] == error_type
     
-    @given(
-        service_name=st.text(min_size=5, max_size=30),
-        success=st.booleans(),
-        details=st.one_of(
-            st.none(),
-            st.dictionaries(
-                st.text(min_size=1, max_size=15),
-                st.one_of(st.text(max_size=30), st.integers(), st.booleans()),
-                min_size=1, max_size=3
-            )
-        )
-    )
-    @settings(max_examples=20)
+    # Hand-picked cases cover both outcomes, with and without details of each value type
+    @pytest.mark.parametrize("service_name,success,details", [
+        ("MarketDataService", True, None),
+        ("MarketDataService", False, None),
+        ("CrewAIBackend", True, {"model": "test-model"}),
+        ("CrewAIBackend", False, {"retries": 3, "fallback": True}),
+        ("A2AHandlers", True, {"agent_id": "test-agent", "pool_size": 10, "debug": False}),
+        ("A2AHandlers", False, {"": ""}),
+        ("svc \u00e9t\u00e9 \u6f22\u5b57", True, {"cl\u00e9": "valeur"}),
+        ("svc with spaces", False, {"timeout": 0})
+    ], ids=["ok", "failed", "ok-str", "failed-mixed", "ok-three", "failed-empty-str", "unicode", "failed-zero"])
     def test_service_initialization_logging_property(self, service_name, success, details):
         """
         Property test for service initialization logging.
         Verifies that service initialization events are properly logged.
         """
+        self.reset_log_entries()
+        
         error = None if success else Exception("Test initialization error")
         
         # Log service initialization
         self.logger.log_service_initialization(service_name, success, details, error)
         
-        # Read log entries
-        log_entries = self.read_log_entries()
-        assert len(log_entries) > 0
-        
         # Find the service initialization log entry
-        init_entry = None
-        for entry in log_entries:
-            if ("context" in entry and 
-                entry["context"].get("event_type") == "service_initialization" and
-                entry["context"].get("service") == service_name):
-                init_entry = entry
-                break
+        init_entry = self.latest_entry("service_initialization")
         
         assert init_entry is not None
         
@@ -379,113 +424,96 @@ class TestErrorLoggingProperty:
         if not success:
             assert "error" in context
     
-    def test_market_data_service_error_logging_integration(self):
+    def test_market_data_service_error_logging_integration(self, mcp_config):
         """
         Integration test for MarketDataService error logging.
         Tests that the service properly logs errors through the logging system.
         """
-        # Create MarketDataService with mocked logger
-        with patch('market_data.get_logger') as mock_get_logger:
-            mock_logger = Mock()
-            mock_get_logger.return_value = mock_logger
+        # Create MarketDataService with its module logger recorded
+        with patch('market_data.logger', _RecordingLogger()) as recorder:
+            service = MarketDataService(mcp_config)
             
-            service = MarketDataService(self.mock_mcp_config)
-            
-            # Test API error logging
-            with patch.object(service.session, 'get') as mock_get:
+            # Test API error logging; the service POSTs its requests
+            with patch.object(service.session, 'post') as mock_post:
                 mock_response = Mock()
                 mock_response.status_code = 500
+                mock_response.content = json.dumps({"error": "Server error"}).encode()
                 mock_response.json.return_value = {"error": "Server error"}
                 mock_response.text = "Internal server error"
                 mock_response.url = "https://test-api.example.com"
                 mock_response.headers = {"Content-Type": "application/json"}
-                mock_get.return_value = mock_response
+                mock_post.return_value = mock_response
                 
                 # This should trigger error logging
                 with pytest.raises(MCPAPIError):
                     service.fetch_market_data(["BTC"])
                 
                 # Verify error logging was called
-                mock_logger.log_error.assert_called()
+                assert recorder.calls_to("log_error")
     
-    def test_crewai_backend_error_logging_integration(self):
+    def test_crewai_backend_error_logging_integration(self, crewai_backend):
         """
         Integration test for CrewAI backend error logging.
         Tests that the backend properly logs processing errors.
         """
-        with patch('crewai_backend.get_logger') as mock_get_logger:
-            mock_logger = Mock()
-            mock_get_logger.return_value = mock_logger
-            
-            # Create backend without AI model (will use fallback)
-            with patch('crewai_backend.GENAI_AVAILABLE', False):
-                backend = MCPCrewAIBackend(self.mock_crewai_config)
-            
-            # Test error handling
-            test_error = Exception("Test processing error")
-            result = backend.handle_processing_errors(test_error, None)
-            
-            # Verify error was logged
-            mock_logger.log_error.assert_called_once()
-            args, kwargs = mock_logger.log_error.call_args
-            assert args[0] == test_error
-            assert "operation" in args[1]
+        backend, recorder = crewai_backend
+        recorder.calls.clear()
+        
+        # Test error handling
+        test_error = Exception("Test processing error")
+        result = backend.handle_processing_errors(test_error, None)
+        
+        # Verify error was logged
+        error_calls = recorder.calls_to("log_error")
+        assert len(error_calls) == 1
+        args, kwargs = error_calls[0]
+        assert args[0] == test_error
+        assert "operation" in args[1]
     
-    def test_a2a_handlers_error_logging_integration(self):
+    def test_a2a_handlers_error_logging_integration(self, a2a_handlers):
         """
         Integration test for A2A handlers error logging.
         Tests that handlers properly log communication errors.
         """
-        with patch('a2a_handlers.get_logger') as mock_get_logger:
-            mock_logger = Mock()
-            mock_get_logger.return_value = mock_logger
-            
-            # Create mock protocol and registry
-            mock_protocol = Mock()
-            mock_registry = Mock()
-            mock_protocol.registry = mock_registry
-            
-            handlers = A2AHandlers(mock_protocol, self.mock_a2a_config)
-            
-            # Test validation error logging
-            invalid_message = {"invalid": "message"}
-            
-            with pytest.raises(Exception):  # Should raise HTTPException
-                handlers.receive_message(invalid_message)
-            
-            # Verify error logging was called
-            mock_logger.log_a2a_communication.assert_called()
-            args, kwargs = mock_logger.log_a2a_communication.call_args
-            assert args[0] == False  # success = False
-            assert "error_details" in kwargs or len(args) > 2
+        handlers, recorder = a2a_handlers
+        recorder.calls.clear()
+        
+        # Test validation error logging
+        invalid_message = {"invalid": "message"}
+        
+        with pytest.raises(Exception):  # Should raise HTTPException
+            handlers.receive_message(invalid_message)
+        
+        # Verify error logging was called
+        a2a_calls = recorder.calls_to("log_a2a_communication")
+        assert a2a_calls
+        args, kwargs = a2a_calls[-1]
+        assert args[0] == False  # success = False
+        assert "error_details" in kwargs or len(args) > 2
     
-    @given(
-        operation=st.text(min_size=5, max_size=30),
-        duration_ms=st.integers(min_value=1, max_value=10000)
-    )
-    @settings(max_examples=10)
+    # Durations straddle the 5000ms slow-operation threshold
+    @pytest.mark.parametrize("operation,duration_ms", [
+        ("fetch_market_data", 1),
+        ("process_market_data", 250),
+        ("generate_summary", 4999),
+        ("send_message", 5000),
+        ("receive_message", 5001),
+        ("op \u00e9t\u00e9 \u6f22\u5b57", 10000)
+    ], ids=["min", "fast", "below", "at-threshold", "above", "max-unicode"])
     def test_performance_logging_property(self, operation, duration_ms):
         """
         Property test for performance logging.
         Verifies that performance metrics are logged with appropriate severity.
         """
+        self.reset_log_entries()
+        
         details = {"test_detail": "value"}
         
         # Log performance metric
         self.logger.log_processing_performance(operation, duration_ms, details)
         
-        # Read log entries
-        log_entries = self.read_log_entries()
-        assert len(log_entries) > 0
-        
         # Find the performance log entry
-        perf_entry = None
-        for entry in log_entries:
-            if ("context" in entry and 
-                entry["context"].get("event_type") == "performance_metric" and
-                entry["context"].get("operation") == operation):
-                perf_entry = entry
-                break
+        perf_entry = self.latest_entry("performance_metric")
         
         assert perf_entry is not None
         
@@ -499,4 +527,131 @@ class TestErrorLoggingProperty:
         if duration_ms > 5000:
             assert perf_entry["level"] == "WARNING"
         else:
-            assert perf_entry["level"] == "INFO"
\ No newline at end of file
+            assert perf_entry["level"] == "INFO"
+
+
+class TestStructuredFormatter:
+    """Tests for the JSON formatter shared by MCPLogger handlers"""
+
+    def test_format_serializes_build_entry(self):
+        """format() emits exactly the entry build_entry() produces"""
+        formatter = StructuredFormatter()
+        record = logging.LogRecord("test_formatter", logging.WARNING, __file__, 1, "payment %s", ("failed",), None)
+        record.payment_context = {"event_type": "payment_verification", "success": False}
+
+        entry = formatter.build_entry(record)
+
+        assert entry["message"] == "payment failed"
+        assert entry["payment_context"] == record.payment_context
+        assert json.loads(formatter.format(record)) == entry
+
+
+class TestQueuedLogging:
+    """Tests for the queue and listener thread shared by every MCPLogger"""
+
+    def test_loggers_share_one_listener_thread(self):
+        """Creating another logger does not start another listener thread"""
+        first = get_logger("test_shared_listener_a")
+        before = threading.active_count()
+        second = get_logger("test_shared_listener_b")
+        try:
+            assert threading.active_count() == before
+        finally:
+            first.close()
+            second.close()
+
+    def test_message_args_are_merged_when_queued(self, tmp_path):
+        """Changing a mutable argument after the call does not change the written message"""
+        log_path = tmp_path / "queued.log"
+        mcp_logger = get_logger("test_queued_args", "INFO", str(log_path))
+        symbols = ["BTC"]
+        try:
+            mcp_logger.logger.info("symbols %s", symbols)
+            symbols.append("ETH")
+            mcp_logger.flush()
+            entry = json.loads(log_path.read_text(encoding="utf-8").splitlines()[-1])
+        finally:
+            mcp_logger.close()
+
+        assert entry["message"] == "symbols ['BTC']"
+
+
+class TestCountingRotatingFileHandler:
+    """Tests for the size-tracking rotating file handler used by MCPLogger"""
+
+    def test_rolls_over_at_max_bytes(self, tmp_path):
+        """Records roll into backups once the counted size would exceed maxBytes"""
+        log_path = tmp_path / "agent.log"
+        handler = CountingRotatingFileHandler(str(log_path), maxBytes=300, backupCount=2)
+        handler.setFormatter(StructuredFormatter())
+        test_logger = logging.getLogger("test_counting_rotation")
+        test_logger.propagate = False
+        test_logger.addHandler(handler)
+
+        try:
+            for i in range(10):
+                test_logger.warning("rotation message %d", i)
+        finally:
+            test_logger.removeHandler(handler)
+            handler.close()
+
+        assert (tmp_path / "agent.log.1").exists()
+        assert (tmp_path / "agent.log.2").exists()
+        assert not (tmp_path / "agent.log.3").exists()
+        for path in tmp_path.iterdir():
+            assert path.stat().st_size < 300
+
+    def test_counts_encoded_bytes(self, tmp_path):
+        """Non-ASCII messages are counted by their encoded size, matching the file on disk"""
+        log_path = tmp_path / "agent.log"
+        handler = CountingRotatingFileHandler(str(log_path), maxBytes=10000, backupCount=1, encoding="utf-8")
+        handler.setFormatter(StructuredFormatter())
+        test_logger = logging.getLogger("test_counting_bytes")
+        test_logger.propagate = False
+        test_logger.addHandler(handler)
+
+        try:
+            test_logger.warning("price \u00e9t\u00e9 \u6f22\u5b57 \u20ac")
+            assert handler._bytes_written == log_path.stat().st_size
+        finally:
+            test_logger.removeHandler(handler)
+            handler.close()
+
+    def test_counts_bytes_in_locale_encoding_by_default(self, tmp_path):
+        """Without an explicit encoding, bytes are counted in the locale encoding the file is written in"""
+        log_path = tmp_path / "agent.log"
+        script = textwrap.dedent("""
+            import logging
+            import sys
+            from logging_config import CountingRotatingFileHandler
+
+            handler = CountingRotatingFileHandler(sys.argv[1], maxBytes=10000, backupCount=1, errors="backslashreplace")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            handler.emit(logging.makeLogRecord({"msg": "price \\u00e9t\\u00e9 \\u20ac"}))
+            handler.close()
+            print(handler._bytes_written)
+        """)
+        # An ASCII locale with locale coercion and UTF-8 mode off gives a non-UTF-8 default
+        env = dict(os.environ, LC_ALL="C", PYTHONCOERCECLOCALE="0", PYTHONUTF8="0")
+
+        result = subprocess.run(
+            [sys.executable, "-X", "utf8=0", "-c", script, str(log_path)],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=env, capture_output=True, text=True, timeout=60
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stderr == ""
+        assert log_path.read_bytes() == b"price \\xe9t\\xe9 \\u20ac\n"
+        assert int(result.stdout) == log_path.stat().st_size
+
+    def test_counts_existing_file_size(self, tmp_path):
+        """The byte count starts from the size of an existing log file"""
+        log_path = tmp_path / "agent.log"
+        log_path.write_text("x" * 120)
+
+        handler = CountingRotatingFileHandler(str(log_path), maxBytes=1000, backupCount=1)
+        try:
+            assert handler._bytes_written == 120
+        finally:
+            handler.close()
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Tests for the persistent prompt-response cache.
+Tests hit/miss behavior, TTL expiry, LRU eviction, and persistence across instances.
+"""
+
+import sqlite3
+import threading
+from unittest.mock import patch
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_cache import PromptCache
+
+
+class TestPromptCache:
+    """Test suite for PromptCache"""
+
+    def test_miss_then_hit(self, tmp_path):
+        """Test that a stored response is returned for the same prompt"""
+        cache = PromptCache(str(tmp_path / "cache.db"))
+
+        assert cache.get("What is BTC doing?") is None
+        cache.set("What is BTC doing?", "BTC is up 2.5%")
+        assert cache.get("What is BTC doing?") == "BTC is up 2.5%"
+
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_entries_persist_across_instances(self, tmp_path):
+        """Test that a new cache instance on the same file sees earlier entries"""
+        db_path = str(tmp_path / "cache.db")
+        PromptCache(db_path).set("prompt", "response")
+
+        assert PromptCache(db_path).get("prompt") == "response"
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Test that entries older than the TTL are not returned"""
+        cache = PromptCache(str(tmp_path / "cache.db"), ttl_seconds=60)
+
+        with patch("prompt_cache.time.time", return_value=1000.0):
+            cache.set("prompt", "response")
+
+        with patch("prompt_cache.time.time", return_value=1061.0):
+            assert cache.get("prompt") is None
+
+        assert cache.stats()["entries"] == 0
+
+    def test_least_recently_used_entry_is_evicted(self, tmp_path):
+        """Test that exceeding max_entries evicts the least recently used prompt"""
+        cache = PromptCache(str(tmp_path / "cache.db"), ttl_seconds=3600, max_entries=2)
+
+        with patch("prompt_cache.time.time", return_value=1000.0):
+            cache.set("first", "1")
+        with patch("prompt_cache.time.time", return_value=1001.0):
+            cache.set("second", "2")
+        with patch("prompt_cache.time.time", return_value=1002.0):
+            assert cache.get("first") == "1"
+        with patch("prompt_cache.time.time", return_value=1003.0):
+            cache.set("third", "3")
+
+        with patch("prompt_cache.time.time", return_value=1004.0):
+            assert cache.get("second") is None
+            assert cache.get("first") == "1"
+            assert cache.get("third") == "3"
+
+    def test_clear_cache(self, tmp_path):
+        """Test that clear_cache removes entries and resets counters"""
+        cache = PromptCache(str(tmp_path / "cache.db"))
+        cache.set("prompt", "response")
+        cache.get("prompt")
+
+        cache.clear_cache()
+
+        assert cache.stats() == {"entries": 0, "hits": 0, "misses": 0}
+
+    def test_one_connection_per_cache(self, tmp_path):
+        """Test that operations reuse the cache's connection instead of opening one each"""
+        with patch("prompt_cache.sqlite3.connect", wraps=sqlite3.connect) as mock_connect:
+            cache = PromptCache(str(tmp_path / "cache.db"))
+            cache.set("prompt", "response")
+            cache.get("prompt")
+            cache.get("other")
+            cache.stats()
+            cache.clear_cache()
+
+        assert mock_connect.call_count == 1
+
+    def test_get_does_not_write(self, tmp_path):
+        """Test that hits, misses and expired lookups leave the database untouched"""
+        cache = PromptCache(str(tmp_path / "cache.db"), ttl_seconds=60)
+        with patch("prompt_cache.time.time", return_value=1000.0):
+            cache.set("fresh", "1")
+        with patch("prompt_cache.time.time", return_value=900.0):
+            cache.set("stale", "2")
+        changes = cache._conn.total_changes
+
+        with patch("prompt_cache.time.time", return_value=1030.0):
+            assert cache.get("fresh") == "1"
+            assert cache.get("stale") is None
+            assert cache.get("missing") is None
+
+        assert cache._conn.total_changes == changes
+
+    def test_set_purges_expired_entries(self, tmp_path):
+        """Test that expired rows left by get are removed by the next set"""
+        cache = PromptCache(str(tmp_path / "cache.db"), ttl_seconds=60)
+        with patch("prompt_cache.time.time", return_value=1000.0):
+            cache.set("stale", "1")
+        with patch("prompt_cache.time.time", return_value=1061.0):
+            cache.set("fresh", "2")
+
+        rows = cache._conn.execute("SELECT COUNT(*) FROM prompt_cache").fetchone()[0]
+        assert rows == 1
+
+    def test_close_writes_pending_access_times(self, tmp_path):
+        """Test that hit times recorded in memory reach the database on close"""
+        db_path = str(tmp_path / "cache.db")
+        cache = PromptCache(db_path, ttl_seconds=3600)
+        with patch("prompt_cache.time.time", return_value=1000.0):
+            cache.set("prompt", "response")
+        with patch("prompt_cache.time.time", return_value=1500.0):
+            cache.get("prompt")
+        cache.close()
+
+        conn = sqlite3.connect(db_path)
+        try:
+            last_access = conn.execute("SELECT last_access FROM prompt_cache").fetchone()[0]
+        finally:
+            conn.close()
+        assert last_access == 1500.0
+
+    def test_shared_between_threads(self, tmp_path):
+        """Test that worker threads can use one cache instance"""
+        cache = PromptCache(str(tmp_path / "cache.db"), ttl_seconds=3600)
+        errors = []
+
+        def worker(index):
+            try:
+                for i in range(20):
+                    cache.set(f"prompt {index} {i}", f"response {index} {i}")
+                    assert cache.get(f"prompt {index} {i}") == f"response {index} {i}"
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert cache.stats()["entries"] == 80
@@ -10,12 +10,29 @@ import requests
 import json
 from web3 import Web3
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes, using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
 # Configuration
 ORCHESTRATOR_URL = "http://localhost:3000" # Fake Orchestrator
 AGENT_URL = "http://localhost:8000"
 TASK_ESCROW_ADDR = "0x71be791E25abacA49FEaD19054FB044686c90c3b" # Placeholder
 AgENT_ID = "0"
 
+# Reused for every dispatch so repeated calls to the agent skip the TCP handshake
+session = requests.Session()
+# Bodies are pre-encoded with _dumps, so declare the content type once
+session.headers["Content-Type"] = "application/json"
+
 def create_task_on_chain(task_id: str, budget: int):
     print(f"[Orchestrator] Creating task {task_id} on chain with budget {budget}...")
     # Real implementation would call TaskEscrow.createTask(...) via Web3
@@ -39,7 +56,7 @@ def dispatch_task_to_agent(task_id: str, prompt: str):
             # X-PAYMENT header would be here if using x402
         }
         
-        resp = requests.post(f"{AGENT_URL}/agent", json=payload, headers=headers)
+        resp = session.post(f"{AGENT_URL}/agent", data=_dumps(payload), headers=headers)
         print(f"[Agent Response] {resp.status_code} - {resp.json()}")
     except Exception as e:
         print(f"Failed to dispatch: {e}")
@@ -55,4 +72,5 @@ def main():
     dispatch_task_to_agent(task_id, "Analyze the market sentiment for CRO")
 
 if __name__ == "__main__":
-    main()
+    with session:
+        main()
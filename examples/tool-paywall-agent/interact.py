@@ -1,3 +1,4 @@
+import functools
 import requests
 import json
 import base64
@@ -5,12 +6,31 @@ import time
 from eth_account import Account
 from eth_account.messages import encode_defunct
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes, using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
 # --- CONFIG ---
 URL = "http://localhost:8001/agent"
 MNEMONIC = "dish public milk ramp capable venue poverty grain useless december hedgehog shuffle"
 Account.enable_unaudited_hdwallet_features()
 user = Account.from_mnemonic(MNEMONIC)
 
+# One keep-alive connection serves the whole free -> paywall -> paid flow
+session = requests.Session()
+# Bodies are pre-encoded with _dumps, so declare the content type once
+session.headers["Content-Type"] = "application/json"
+
+# Signing is deterministic, so a repeated challenge reuses its token instead of re-signing
+@functools.lru_cache(maxsize=64)
 def sign_payment(challenge_b64):
     """Signs a payment for a specific challenge."""
     # Simplified signing for the demo
@@ -22,18 +42,18 @@ def sign_payment(challenge_b64):
         "signature": signed.signature.hex(),
         "address": user.address
     }
-    return base64.b64encode(json.dumps(payment_obj).encode()).decode()
+    return base64.b64encode(_dumps(payment_obj)).decode()
 
 def test_flow():
     # 1. Chat for free
     print("\n1. Sending free chat prompt...")
-    r1 = requests.post(URL, json={"prompt": "How are you today?"})
+    r1 = session.post(URL, data=_dumps({"prompt": "How are you today?"}))
     print(f"Status: {r1.status_code}")
     print(f"Response: {r1.json().get('result')}")
 
     # 2. Try to trigger a tool
     print("\n2. Requesting a premium tool (say_hello)...")
-    r2 = requests.post(URL, json={"prompt": "Please use the say_hello tool."})
+    r2 = session.post(URL, data=_dumps({"prompt": "Please use the say_hello tool."}))
     print(f"Status: {r2.status_code}")
     
     if r2.status_code == 402:
@@ -54,10 +74,11 @@ def test_flow():
         # Note: In real life, we don't need bypass here if using signature verification
         # But for this demo, we use the local signature check in the server
         headers = {"X-PAYMENT": payment_token}
-        r3 = requests.post(URL, json={"prompt": "Please use the say_hello tool."}, headers=headers)
+        r3 = session.post(URL, data=_dumps({"prompt": "Please use the say_hello tool."}), headers=headers)
         
         print(f"Status: {r3.status_code}")
         print(f"Response: {r3.json().get('result')}")
 
 if __name__ == "__main__":
-    test_flow()
+    with session:
+        test_flow()
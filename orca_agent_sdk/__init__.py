@@ -2,5 +2,6 @@ from .agent import OrcaAgent
 from .cdc_agent import CryptoComAgent as CDCAgent
 from .contract_agent import ContractAgent
 from .config import AgentConfig
+from .server import AgentServer
 
-__all__ = ["OrcaAgent", "CDCAgent", "ContractAgent", "AgentConfig"]
+__all__ = ["OrcaAgent", "CDCAgent", "ContractAgent", "AgentConfig", "AgentServer"]
@@ -5,9 +5,15 @@
 import time
 import uuid
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from dataclasses import dataclass
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 @dataclass
 class AgentInfo:
     agent_id: str
@@ -30,6 +36,10 @@ class AgentRegistry:
             name=name
         )
 
+    def register_many(self, agents: Iterable[AgentInfo]):
+        # Bulk insert for registry warmup, e.g. hydrating known agents from config
+        self._local_agents.update({agent.agent_id: agent for agent in agents})
+
     def get_agent(self, agent_id: str) -> Optional[AgentInfo]:
         # 1. Check local cache
         if agent_id in self._local_agents:
@@ -50,9 +60,12 @@ class AgentRegistry:
         return None
 
 class A2AProtocol:
-    def __init__(self, agent_id: str, registry: AgentRegistry):
+    def __init__(self, agent_id: str, registry: AgentRegistry, session: Optional[requests.Session] = None, timeout: float = 10):
         self.agent_id = agent_id
         self.registry = registry
+        # Optional pooled session for keep-alive sends; requests.post is used when unset
+        self.session = session
+        self.timeout = timeout
 
     def create_message(self, to_agent_id: str, action: str, payload: Dict[str, Any], task_id: Optional[str] = None, sub_task_id: Optional[str] = None, max_budget: Optional[float] = None) -> Dict[str, Any]:
         msg_task = {
@@ -85,7 +98,13 @@ class A2AProtocol:
         
         try:
             url = f"{target.endpoint.rstrip('/')}/a2a/receive"
-            resp = requests.post(url, json=msg, timeout=10)
+            post = self.session.post if self.session is not None else requests.post
+            if HAS_ORJSON:
+                # Pre-encoded body; OPT_NON_STR_KEYS keeps json's handling of int/float keys
+                body = orjson.dumps(msg, option=orjson.OPT_NON_STR_KEYS)
+                resp = post(url, data=body, headers={"Content-Type": "application/json"}, timeout=self.timeout)
+            else:
+                resp = post(url, json=msg, timeout=self.timeout)
             resp.raise_for_status()
             return resp.json()
         except Exception as e:
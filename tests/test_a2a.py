@@ -1,8 +1,16 @@
 
+import json
 import unittest
 from unittest.mock import MagicMock, patch
+from orca_agent_sdk.core import a2a as a2a_module
 from orca_agent_sdk.core.a2a import A2AProtocol, AgentRegistry, AgentInfo
 
+def sent_message(kwargs):
+    # Pre-encoded orjson body when orjson is installed, requests' json= otherwise
+    if 'data' in kwargs:
+        return json.loads(kwargs['data'])
+    return kwargs['json']
+
 class TestA2AProtocol(unittest.TestCase):
     def setUp(self):
         self.registry = AgentRegistry()
@@ -29,8 +37,66 @@ class TestA2AProtocol(unittest.TestCase):
         
         args, kwargs = mock_post.call_args
         self.assertEqual(args[0], "http://agent2.com/a2a/receive")
-        self.assertIn("task", str(kwargs['json']) if 'task' in kwargs['json'] else "")
-        self.assertEqual(kwargs['json']['header']['to'], "agent2")
+        sent = sent_message(kwargs)
+        self.assertIn("task", sent)
+        self.assertEqual(sent['header']['to'], "agent2")
+
+    def test_send_message_uses_session(self):
+        session = MagicMock()
+        session.post.return_value.json.return_value = {"status": "ok"}
+        a2a = A2AProtocol("agent1", self.registry, session=session, timeout=3)
+
+        with patch('requests.post') as mock_post:
+            resp = a2a.send_message("agent2", "chat", {"text": "hi"})
+
+        self.assertEqual(resp, {"status": "ok"})
+        mock_post.assert_not_called()
+        args, kwargs = session.post.call_args
+        self.assertEqual(args[0], "http://agent2.com/a2a/receive")
+        self.assertEqual(kwargs['timeout'], 3)
+        self.assertEqual(sent_message(kwargs)['header']['to'], "agent2")
+
+    @patch('requests.post')
+    def test_send_message_default_timeout(self, mock_post):
+        mock_post.return_value.json.return_value = {"status": "ok"}
+
+        self.a2a.send_message("agent2", "chat", {"text": "hi"})
+
+        self.assertEqual(mock_post.call_args.kwargs['timeout'], 10)
+
+    @unittest.skipUnless(a2a_module.HAS_ORJSON, "orjson not installed")
+    @patch('requests.post')
+    def test_send_message_encodes_with_orjson(self, mock_post):
+        mock_post.return_value.json.return_value = {"status": "ok"}
+
+        self.a2a.send_message("agent2", "chat", {"text": "hi", 1: "one"})
+
+        kwargs = mock_post.call_args.kwargs
+        self.assertNotIn('json', kwargs)
+        self.assertIsInstance(kwargs['data'], bytes)
+        self.assertEqual(kwargs['headers']['Content-Type'], "application/json")
+        # Non-string keys are stringified, as json.dumps would do
+        self.assertEqual(json.loads(kwargs['data'])['task']['payload'], {"text": "hi", "1": "one"})
+
+    @patch('requests.post')
+    def test_send_message_without_orjson(self, mock_post):
+        mock_post.return_value.json.return_value = {"status": "ok"}
+
+        with patch.object(a2a_module, 'HAS_ORJSON', False):
+            self.a2a.send_message("agent2", "chat", {"text": "hi"})
+
+        kwargs = mock_post.call_args.kwargs
+        self.assertNotIn('data', kwargs)
+        self.assertEqual(kwargs['json']['task']['payload'], {"text": "hi"})
+
+    def test_register_many(self):
+        self.registry.register_many([
+            AgentInfo("agent3", "http://agent3.com", ["chat"], "Agent Three"),
+            AgentInfo("agent4", "http://agent4.com", [], "Agent Four"),
+        ])
+        self.assertEqual(self.registry.get_agent("agent3").endpoint, "http://agent3.com")
+        self.assertEqual(self.registry.get_agent("agent4").name, "Agent Four")
+        self.assertEqual(self.registry.get_agent("agent2").name, "Agent Two")
 
     def test_send_message_unknown_agent(self):
         with self.assertRaises(ValueError):